@@ -5,6 +5,7 @@ from sqlalchemy import select
 from app.api.deps import get_db
 from app.models import Brand, PageTypeKnowledge, DOMSelector, CodeRule, User
 from app.models.enums import UserRole, BrandStatus
+from app.services.selector_validator import invalidate_selector_cache
 from datetime import datetime
 
 router = APIRouter()
@@ -252,6 +253,7 @@ utils.waitForElement("button[data-test-id='vf-button']", 10000).then(function(ad
             user_created = True
         
         await db.commit()
+        invalidate_selector_cache(vans.id)
         
         message = "Database seeded successfully" if not brands_seeded else "Database check completed - missing data created"
         
@@ -12,6 +12,7 @@ from app.schemas.brand import BrandCreate, BrandUpdate, BrandResponse
 from app.core.exceptions import NotFoundException, ConflictException
 from app.core.auth import require_role, get_user_brand_access, get_current_user_dependency
 from app.models.enums import BrandRole
+from app.services.selector_validator import invalidate_selector_cache
 
 router = APIRouter()
 
@@ -127,5 +128,7 @@ async def delete_brand(
     
     await db.delete(brand)
     await db.commit()
+    # The brand's selectors were deleted with it
+    invalidate_selector_cache(brand_id)
     return None
 
@@ -690,26 +690,37 @@ async def list_conversations(
         .order_by(Conversation.updated_at.desc())
     )
     conversations = conversations_result.scalars().all()
+    conversation_ids = [conv.id for conv in conversations]
     
-    # Build response with preview and last message
-    result = []
-    for conv in conversations:
-        # Get first user message for preview
+    # Fetch the first user message and the last message of every conversation
+    # with one DISTINCT ON query each, rather than two queries per conversation
+    first_user_msgs = {}
+    last_msgs = {}
+    if conversation_ids:
         first_user_msg_result = await db.execute(
             select(Message).where(
-                Message.conversation_id == conv.id,
+                Message.conversation_id.in_(conversation_ids),
                 Message.role == "user"
-            ).order_by(Message.created_at).limit(1)
+            )
+            .distinct(Message.conversation_id)
+            .order_by(Message.conversation_id, Message.created_at)
         )
-        first_user_msg = first_user_msg_result.scalar_one_or_none()
-        preview = first_user_msg.content[:100] if first_user_msg else "New conversation"
+        first_user_msgs = {msg.conversation_id: msg for msg in first_user_msg_result.scalars()}
         
-        # Get last message
         last_msg_result = await db.execute(
-            select(Message).where(Message.conversation_id == conv.id)
-            .order_by(Message.created_at.desc()).limit(1)
+            select(Message).where(Message.conversation_id.in_(conversation_ids))
+            .distinct(Message.conversation_id)
+            .order_by(Message.conversation_id, Message.created_at.desc())
         )
-        last_msg = last_msg_result.scalar_one_or_none()
+        last_msgs = {msg.conversation_id: msg for msg in last_msg_result.scalars()}
+    
+    # Build response with preview and last message
+    result = []
+    for conv in conversations:
+        first_user_msg = first_user_msgs.get(conv.id)
+        preview = first_user_msg.content[:100] if first_user_msg else "New conversation"
+        
+        last_msg = last_msgs.get(conv.id)
         last_message = last_msg.content[:100] if last_msg else None
         
         result.append(ConversationPreview(
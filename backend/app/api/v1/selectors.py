@@ -13,6 +13,7 @@ from app.models.user import User
 from app.schemas.dom_selector import DOMSelectorCreate, DOMSelectorUpdate, DOMSelectorResponse, DOMSelectorEnhancedResponse
 from app.core.exceptions import NotFoundException
 from app.core.auth import require_role, get_user_brand_access
+from app.services.selector_validator import invalidate_selector_cache
 
 logger = logging.getLogger(__name__)
 
@@ -79,6 +80,7 @@ async def create_selector(
     db_selector = DOMSelector(**selector.model_dump())
     db.add(db_selector)
     await db.commit()
+    invalidate_selector_cache(db_selector.brand_id)
     await db.refresh(db_selector)
     return db_selector
 
@@ -136,11 +138,14 @@ async def update_selector(
             raise NotFoundException("Brand", selector_update.brand_id)
     
     # Update fields
+    previous_brand_id = selector.brand_id
     update_data = selector_update.model_dump(exclude_unset=True)
     for field, value in update_data.items():
         setattr(selector, field, value)
     
     await db.commit()
+    invalidate_selector_cache(previous_brand_id)
+    invalidate_selector_cache(selector.brand_id)
     await db.refresh(selector)
     return selector
 
@@ -158,8 +163,10 @@ async def delete_selector(
     if not selector:
         raise NotFoundException("DOMSelector", selector_id)
     
+    brand_id = selector.brand_id
     await db.delete(selector)
     await db.commit()
+    invalidate_selector_cache(brand_id)
     return None
 
 
@@ -235,6 +242,8 @@ async def create_selectors_bulk(
     # Commit all new selectors in one transaction
     try:
         await db.commit()
+        for brand_id in brand_ids:
+            invalidate_selector_cache(brand_id)
         
         # Refresh all created selectors to get their IDs
         for selector in created_selectors:
@@ -1,5 +1,6 @@
 """Application configuration using Pydantic Settings."""
 import json
+from functools import cached_property
 from pydantic import Field, field_validator
 from pydantic_settings import BaseSettings, SettingsConfigDict
 from typing import List, Optional
@@ -14,6 +15,11 @@ class Settings(BaseSettings):
     LOG_LEVEL: str = "INFO"
     PORT: Optional[int] = 8000
     
+    # Database connection pool
+    DB_POOL_SIZE: int = 5
+    DB_MAX_OVERFLOW: int = 10
+    DB_POOL_RECYCLE: int = 1800  # seconds
+    
     # Make CORS_ORIGINS optional with a good default
     CORS_ORIGINS: List[str] = Field(
         default=["http://localhost:5173", "http://localhost:3000"]
@@ -34,6 +40,16 @@ class Settings(BaseSettings):
                 return [origin.strip() for origin in v.split(',') if origin.strip()]
         return v
     
+    @cached_property
+    def ASYNC_DATABASE_URL(self) -> str:
+        """DATABASE_URL rewritten to use the asyncpg driver, computed once."""
+        database_url = self.DATABASE_URL
+        if database_url.startswith("postgresql://"):
+            return database_url.replace("postgresql://", "postgresql+asyncpg://", 1)
+        if database_url.startswith("postgres://"):
+            return database_url.replace("postgres://", "postgresql+asyncpg://", 1)
+        return database_url
+    
     model_config = SettingsConfigDict(
         env_file=".env",
         case_sensitive=True,
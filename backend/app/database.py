@@ -1,23 +1,19 @@
 """Database configuration and session management."""
 from sqlalchemy.ext.asyncio import create_async_engine, AsyncSession, async_sessionmaker
 from sqlalchemy.orm import DeclarativeBase
-from sqlalchemy.pool import NullPool
 from app.config import settings
 
 
-# Transform DATABASE_URL to use asyncpg driver
-database_url = settings.DATABASE_URL
-if database_url.startswith("postgresql://"):
-    database_url = database_url.replace("postgresql://", "postgresql+asyncpg://", 1)
-elif database_url.startswith("postgres://"):
-    database_url = database_url.replace("postgres://", "postgresql+asyncpg://", 1)
-
-
-# Create async engine with connection pooling
+# Create async engine with connection pooling. LIFO reuse keeps a small set of
+# connections hot, so asyncpg's per-connection prepared statement cache is reused
 engine = create_async_engine(
-    database_url,
+    settings.ASYNC_DATABASE_URL,
     echo=False,
-    poolclass=NullPool,
+    pool_size=settings.DB_POOL_SIZE,
+    max_overflow=settings.DB_MAX_OVERFLOW,
+    pool_recycle=settings.DB_POOL_RECYCLE,
+    pool_pre_ping=True,
+    pool_use_lifo=True,
 )
 
 # Create async session factory
@@ -1,9 +1,13 @@
 """FastAPI application entry point."""
+import logging
+from contextlib import asynccontextmanager
+
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 from sqlalchemy.exc import IntegrityError
 
 from app.config import settings
+from app.database import engine, AsyncSessionLocal
 from app.api.v1.router import router as v1_router
 from app.core.exceptions import (
     NotFoundException,
@@ -12,11 +16,29 @@ from app.core.exceptions import (
     conflict_exception_handler,
     integrity_error_handler,
 )
+from app.services.selector_validator import preload_selector_cache
+
+logger = logging.getLogger(__name__)
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """Application lifespan: warm selector cache on startup, release pooled connections on shutdown."""
+    try:
+        async with AsyncSessionLocal() as db:
+            await preload_selector_cache(db)
+    except Exception as e:
+        # Selector lookups fall back to per-request queries
+        logger.warning(f"Could not preload selector cache: {e}")
+    yield
+    await engine.dispose()
+
 
 app = FastAPI(
     title="Opal Safe Code Generator API",
     description="Admin dashboard API for managing brand-specific code generation rules",
     version="1.0.0",
+    lifespan=lifespan,
 )
 
 # CORS configuration
@@ -1,7 +1,8 @@
 """Brand model."""
-from sqlalchemy import Column, Integer, String, JSON, DateTime, Enum as SQLEnum
+from sqlalchemy import Column, Integer, String, DateTime, Enum as SQLEnum
 from sqlalchemy.orm import relationship
 from sqlalchemy.sql import func
+from sqlalchemy.dialects.postgresql import JSONB
 from app.database import Base
 from app.models.enums import BrandStatus
 
@@ -15,7 +16,7 @@ class Brand(Base):
     name = Column(String(255), nullable=False, unique=True, index=True)
     domain = Column(String(255), nullable=False)
     status = Column(SQLEnum(BrandStatus, native_enum=False, length=50), nullable=False, default=BrandStatus.ACTIVE)
-    code_template = Column(JSON, nullable=True, default={})
+    code_template = Column(JSONB, nullable=True, default={})
     created_at = Column(DateTime(timezone=True), server_default=func.now())
     updated_at = Column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now())
     
@@ -1,5 +1,5 @@
 """DOM Selector model."""
-from sqlalchemy import Column, Integer, String, Text, DateTime, ForeignKey, Enum as SQLEnum
+from sqlalchemy import Column, Computed, Integer, String, Text, DateTime, ForeignKey, Enum as SQLEnum
 from sqlalchemy.orm import relationship
 from sqlalchemy.sql import func
 from sqlalchemy.dialects.postgresql import JSONB
@@ -17,6 +17,11 @@ class DOMSelector(Base):
     page_type = Column(SQLEnum(PageType, native_enum=False, length=50), nullable=False)
     selector = Column(Text, nullable=False)
     description = Column(String(500), nullable=True)
+    # Trimmed, lowercased description maintained by Postgres for matching. btrim
+    # gets an explicit character set since it only strips spaces by default
+    description_lower = Column(
+        String(500), Computed("lower(btrim(description, E' \\t\\n\\r\\f\\013'))", persisted=True)
+    )
     status = Column(SQLEnum(SelectorStatus, native_enum=False, length=50), nullable=False, default=SelectorStatus.ACTIVE, index=True)
     relationships = Column(JSONB, nullable=True, default={})
     created_at = Column(DateTime(timezone=True), server_default=func.now())
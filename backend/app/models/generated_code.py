@@ -1,7 +1,7 @@
 """Generated Code model."""
 from typing import Optional
-from sqlalchemy import Column, Integer, String, Text, Float, JSON, DateTime, ForeignKey, Enum as SQLEnum, Numeric, Boolean
-from sqlalchemy.dialects.postgresql import UUID
+from sqlalchemy import Column, Integer, String, Text, Float, DateTime, ForeignKey, Enum as SQLEnum, Numeric, Boolean
+from sqlalchemy.dialects.postgresql import UUID, JSONB
 from sqlalchemy.orm import relationship
 from sqlalchemy.sql import func
 from app.database import Base
@@ -17,13 +17,13 @@ class GeneratedCode(Base):
     brand_id = Column(Integer, ForeignKey("brands.id", ondelete="CASCADE"), nullable=False, index=True)
     conversation_id = Column(UUID(as_uuid=True), ForeignKey("conversations.id", ondelete="SET NULL"), nullable=True, index=True)
     user_id = Column(Integer, ForeignKey("users.id", ondelete="SET NULL"), nullable=True)
-    request_data = Column(JSON, nullable=True)
+    request_data = Column(JSONB, nullable=True)
     generated_code = Column(Text, nullable=False)
     confidence_score = Column(Float, nullable=True)
-    validation_status = Column(SQLEnum(ValidationStatus, native_enum=False, length=50), nullable=False, default=ValidationStatus.PENDING, index=True)
+    validation_status = Column(SQLEnum(ValidationStatus, native_enum=False, length=50), nullable=False, default=ValidationStatus.PENDING)
     user_feedback = Column(Text, nullable=True)
     deployment_status = Column(SQLEnum(DeploymentStatus, native_enum=False, length=50), nullable=False, default=DeploymentStatus.PENDING)
-    error_logs = Column(JSON, nullable=True)
+    error_logs = Column(JSONB, nullable=True)
     created_at = Column(DateTime(timezone=True), server_default=func.now(), index=True)
     
     # Review fields
@@ -1,10 +1,27 @@
 """CSS Selector validation and extraction service."""
 import re
 import logging
-from typing import List, Dict, Any, Optional
+from functools import lru_cache
+from typing import List, Dict, Any, Optional, Tuple
 
 logger = logging.getLogger(__name__)
 
+# Valid selector starts: tag name, ., #, [, :, *, etc.
+_SELECTOR_START_RE = re.compile(r'^[.#\[:\w*]')
+# Characters that never appear in a CSS selector
+_INVALID_CHARS_RE = re.compile(r'[<>{};]')
+
+# Extraction patterns, see extract_css_selectors_from_message
+_QUOTED_ATTR_RE = re.compile(r'["\'](\[[\w-]+(?:[*^$|~]?=["\'][^\'\"]*["\']?)?\])["\']')
+_QUOTED_ID_CLASS_RE = re.compile(r'["\']([.#][\w-]+)["\']')
+_ATTR_RE = re.compile(r'\[[\w-]+(?:[*^$|~]?=["\'][^\'\"]*["\']?)?\]')
+_ID_RE = re.compile(r'(?:^|\s)(#[a-zA-Z][\w-]*)(?:\s|$|[^a-zA-Z0-9_-])')
+_CLASS_RE = re.compile(r'(?:^|\s)(\.[a-zA-Z][\w-]*)(?:\s|$|[^a-zA-Z0-9_-])')
+_COMPOUND_RE = re.compile(r'[\w-]+(?:\[[\w-]+(?:[*^$|~]?=["\'][^\'\"]*["\']?)?\]|[.#][\w-]+)')
+
+_WORD_START_RE = re.compile(r'^\w')
+_TAG_START_RE = re.compile(r'^[a-zA-Z]')
+
 
 def is_valid_css_selector(selector: str) -> bool:
     """
@@ -23,7 +40,7 @@ def is_valid_css_selector(selector: str) -> bool:
     
     # Basic validation: selector should start with valid characters
     # Valid starts: tag name, ., #, [, :, *, etc.
-    if not re.match(r'^[.#\[:\w*]', selector):
+    if not _SELECTOR_START_RE.match(selector):
         return False
     
     # Check for balanced brackets (for attribute selectors)
@@ -42,16 +59,9 @@ def is_valid_css_selector(selector: str) -> bool:
     if single_quotes % 2 != 0 or double_quotes % 2 != 0:
         return False
     
-    # Basic pattern validation
-    # Allow: tag, .class, #id, [attr], [attr=value], pseudo-classes, combinators
-    valid_pattern = re.compile(
-        r'^([.#]?[\w-]+|\[[\w-]+(?:[*^$|~]?=["\'][^\'\"]*["\']?)?\]|:[\w-]+(?:\([^\)]*\))?|[\s>+~,])+$',
-        re.IGNORECASE
-    )
-    
     # More lenient check - just ensure it doesn't contain obviously invalid patterns
     # Allow common CSS selector characters
-    invalid_chars = re.search(r'[<>{};]', selector)
+    invalid_chars = _INVALID_CHARS_RE.search(selector)
     if invalid_chars:
         return False
     
@@ -82,20 +92,17 @@ def extract_css_selectors_from_message(message: str) -> List[str]:
     
     # Pattern 1: Quoted attribute selectors
     # Matches: "[data-test-id='product-name']" or '[data-test-id="product-name"]'
-    quoted_attr_pattern = r'["\'](\[[\w-]+(?:[*^$|~]?=["\'][^\'\"]*["\']?)?\])["\']'
-    quoted_matches = re.findall(quoted_attr_pattern, message)
+    quoted_matches = _QUOTED_ATTR_RE.findall(message)
     selectors.extend(quoted_matches)
     
     # Pattern 2: Quoted ID/class selectors
     # Matches: "#product-name" or ".product-title"
-    quoted_id_class_pattern = r'["\']([.#][\w-]+)["\']'
-    quoted_id_class_matches = re.findall(quoted_id_class_pattern, message)
+    quoted_id_class_matches = _QUOTED_ID_CLASS_RE.findall(message)
     selectors.extend(quoted_id_class_matches)
     
     # Pattern 3: Attribute selectors in brackets (not quoted)
     # Matches: [data-test-id='product-name'], [class*='product'], [id="test"]
-    attr_pattern = r'\[[\w-]+(?:[*^$|~]?=["\'][^\'\"]*["\']?)?\]'
-    attr_matches = re.findall(attr_pattern, message)
+    attr_matches = _ATTR_RE.findall(message)
     # Filter out matches that were already captured in quoted patterns
     for match in attr_matches:
         # Check if this match is part of a quoted string
@@ -111,34 +118,26 @@ def extract_css_selectors_from_message(message: str) -> List[str]:
     
     # Pattern 4: ID selectors (not quoted)
     # Matches: #product-name (standalone, not part of another word)
-    id_pattern = r'(?:^|\s)(#[a-zA-Z][\w-]*)(?:\s|$|[^a-zA-Z0-9_-])'
-    id_matches = re.findall(id_pattern, message)
+    id_matches = _ID_RE.findall(message)
     selectors.extend(id_matches)
     
     # Pattern 5: Class selectors (not quoted)
     # Matches: .product-title (standalone, not part of another word)
-    class_pattern = r'(?:^|\s)(\.[a-zA-Z][\w-]*)(?:\s|$|[^a-zA-Z0-9_-])'
-    class_matches = re.findall(class_pattern, message)
+    class_matches = _CLASS_RE.findall(message)
     selectors.extend(class_matches)
     
     # Pattern 6: Compound selectors (tag + attribute)
     # Matches: h1[data-test-id='name'], div.product-title
-    compound_pattern = r'[\w-]+(?:\[[\w-]+(?:[*^$|~]?=["\'][^\'\"]*["\']?)?\]|[.#][\w-]+)'
-    compound_matches = re.findall(compound_pattern, message)
+    compound_matches = _COMPOUND_RE.findall(message)
     selectors.extend(compound_matches)
     
-    # Remove duplicates while preserving order
-    seen = set()
-    unique_selectors = []
-    for selector in selectors:
-        if selector not in seen:
-            seen.add(selector)
-            unique_selectors.append(selector.strip())
+    # Remove duplicates (after normalizing whitespace) while preserving order
+    unique_selectors = list(dict.fromkeys(selector.strip() for selector in selectors))
     
     # Sort by specificity (most specific first)
     # Priority: compound > attribute > id/class
     def selector_priority(s: str) -> int:
-        if '[' in s and (s.startswith('.') or s.startswith('#') or re.match(r'^\w', s)):
+        if '[' in s and (s.startswith('.') or s.startswith('#') or _WORD_START_RE.match(s)):
             return 3  # Compound selector (highest priority)
         elif '[' in s:
             return 2  # Attribute selector
@@ -180,7 +179,24 @@ def validate_selector_syntax(selector: str) -> Dict[str, Any]:
         }
     
     normalized = selector.strip()
+    selector_type, is_valid = _classify_selector(normalized)
     
+    result = {
+        "is_valid": is_valid,
+        "selector_type": selector_type,
+        "normalized": normalized,
+        "error": None
+    }
+    
+    if not is_valid:
+        result["error"] = f"Invalid CSS selector syntax: {normalized}"
+    
+    return result
+
+
+@lru_cache(maxsize=2048)
+def _classify_selector(normalized: str) -> Tuple[str, bool]:
+    """Selector type and syntax validity, memoized since selectors recur across turns."""
     # Determine selector type
     selector_type = "unknown"
     if normalized.startswith('#'):
@@ -191,21 +207,8 @@ def validate_selector_syntax(selector: str) -> Dict[str, Any]:
         selector_type = "attribute"
     elif '[' in normalized or (normalized.count('.') > 0 and not normalized.startswith('.')) or (normalized.count('#') > 0 and not normalized.startswith('#')):
         selector_type = "compound"
-    elif re.match(r'^[a-zA-Z]', normalized):
+    elif _TAG_START_RE.match(normalized):
         selector_type = "tag"
     
     # Validate syntax
-    is_valid = is_valid_css_selector(normalized)
-    
-    result = {
-        "is_valid": is_valid,
-        "selector_type": selector_type,
-        "normalized": normalized,
-        "error": None
-    }
-    
-    if not is_valid:
-        result["error"] = f"Invalid CSS selector syntax: {normalized}"
-    
-    return result
-
+    return selector_type, is_valid_css_selector(normalized)
@@ -1,10 +1,16 @@
 """Selector validation service for checking element selectors before code generation."""
 import re
+import time
+import string
+import asyncio
 import logging
-from typing import List, Dict, Optional, Tuple, Any
+from functools import lru_cache
+from itertools import islice
+from typing import List, Dict, Optional, Tuple, Any, FrozenSet
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select, or_, func
+from sqlalchemy import select, and_, func, bindparam, literal_column
 
+from app.models.brand import Brand
 from app.models.dom_selector import DOMSelector
 from app.models.enums import PageType, SelectorStatus
 from app.services.css_selector_validator import (
@@ -14,6 +20,183 @@ from app.services.css_selector_validator import (
 
 logger = logging.getLogger(__name__)
 
+# Direct CSS selectors with . or #, tried in priority order (first hit wins)
+_DIRECT_PATTERNS = (
+    # Quoted selector: ".class" or "#id"
+    re.compile(r'["\']([.#][\w-]+(?:[\w\s-]*)?)["\']', re.IGNORECASE),
+    # "selector: .class" (quotes optional)
+    re.compile(r'(?:selector|css)[:\s]+["\']?([.#][\w-]+(?:[\w\s-]*)?)["\']?', re.IGNORECASE),
+    # "selector: .class" without the trailing words, for when the capture above
+    # picks up characters that fail the selector shape check
+    re.compile(r'(?:selector|css)[:\s]+([.#][\w-]+)', re.IGNORECASE),
+    # Standalone selector: .class or #id
+    re.compile(r'\b([.#][\w-]+)\b', re.IGNORECASE),
+)
+
+# Natural language ID/class references, tried in priority order (first hit wins):
+#   "id is 'product-name'", "id='product-name'", "id: product-name" (also covers "h1 id is 'x'")
+#   "the id product-name"
+#   "id product-name"
+_ID_PATTERNS = (
+    re.compile(r'id\s*(?:is|=|:)\s*["\']?([a-zA-Z0-9_-]+)'),
+    re.compile(r'the\s+id\s+["\']?([a-zA-Z0-9_-]+)'),
+    re.compile(r'id\s+["\']?([a-zA-Z0-9_-]+)'),
+)
+_CLASS_PATTERNS = (
+    re.compile(r'class\s*(?:is|=|:)\s*["\']?([a-zA-Z0-9_-]+)'),
+    re.compile(r'the\s+class\s+["\']?([a-zA-Z0-9_-]+)'),
+    re.compile(r'class\s+["\']?([a-zA-Z0-9_-]+)'),
+)
+# Whitespace and quotes trimmed from captured selectors in one strip() call
+_STRIP_CHARS = " \t\n\r\f\v\"'"
+
+# Basic shape of a user-provided selector (selectors are ASCII in practice):
+# a '.', '#' or '[' followed by word characters, whitespace and -[]="'
+_SELECTOR_FIRST_CHARS = frozenset('.#[')
+_SELECTOR_BODY_CHARS = frozenset(string.ascii_letters + string.digits + string.whitespace + '_-[]="\'')
+
+# Characters allowed in an identifier besides ASCII letters and digits
+_IDENT_STRIP = str.maketrans('', '', '-_')
+
+# ID/class keywords in the conversation context
+_ID_CONTEXT_RE = re.compile(r'\b(?:id|identifier|element\s+id|h1\s+id|div\s+id)\b', re.IGNORECASE)
+_CLASS_CONTEXT_RE = re.compile(r'\b(?:css\s+class|element\s+class|class\s+name|class)\b', re.IGNORECASE)
+
+# "it's X" / "it is X" after an ID or class has been mentioned
+_ITS_RE = re.compile(r"(?:it'?s?|it\s+is)\s+['\"]?([a-zA-Z0-9_-]+)['\"]?")
+
+# Bare selector names (no prefix) and the common words never treated as one
+_BARE_NAME = re.compile(r'\b([a-zA-Z][a-zA-Z0-9_-]{2,})\b')
+_COMMON_WORDS: FrozenSet[str] = frozenset({
+    "the", "and", "for", "with", "that", "this", "product", "page", "element",
+    "button", "text", "name", "title", "price", "cart", "checkout", "home"
+})
+
+# Attribute selectors: [attr] or [attr="value"]
+_ATTR_SELECTOR = re.compile(r'\[[\w-]+(?:=["\'][^"\']+["\'])?\]')
+
+# Phrases from the "multiple selectors found" prompt (see _format_multiple_matches_message)
+_MULTI_SELECT_HINT_RE = re.compile(r'found multiple selectors|which selector should i use', re.IGNORECASE)
+
+# Selector choice by number: "use selector 3", "option 2", "number 1", "3"
+_USE_SELECTOR_RE = re.compile(r'use\s+(?:selector|option)\s+(\d+)')
+_SELECTOR_OPTION_RE = re.compile(r'(?:selector|option)\s+(\d+)')
+_NUMBER_USE_RE = re.compile(r'(?:number|use)\s+(\d+)')
+
+# Numbered option lines: "1. description (selector: .selector)" or "1. selector-value"
+_CHOICE_WITH_SELECTOR_RE = re.compile(r'^(\d+)\.\s+.*?\(selector:\s*([^\)]+)\)', re.IGNORECASE)
+_CHOICE_BARE_RE = re.compile(r'^(\d+)\.\s+([^\s\)]+)(?:\s|$)')
+
+# Element description phrasings: "change [element]", "[element] on [page]", "[page] [element]"
+_CHANGE_RE = re.compile(r'(?:change|modify|update|edit|adjust)\s+([^.,!?]+?)(?:\s+to|\s+on|[,\.!?]|$)')
+_PAGE_RE = re.compile(r'([^.,!?]+?)\s+on\s+(?:pdp|cart|checkout|home|category|search)')
+_REVERSE_RE = re.compile(r'(?:pdp|cart|checkout|home|category|search)\s+([^.,!?]+?)(?:[,\.!?]|$)')
+
+# Keyword extraction: words longer than two characters, minus common stop words
+_KEYWORD_RE = re.compile(r'\w{3,}')
+_STOP_WORDS: FrozenSet[str] = frozenset({
+    "the", "a", "an", "and", "or", "but", "in", "on", "at", "to", "for",
+    "of", "with", "by", "from", "as", "is", "are", "was", "were", "be",
+    "been", "have", "has", "had", "do", "does", "did", "will", "would",
+    "could", "should", "may", "might", "must", "can", "this", "that",
+    "these", "those", "off", "up", "down", "out", "over", "under"
+})
+
+# Active status rendered inline rather than bound per query. SQLEnum(native_enum=False)
+# stores the member name, and a literal lets the planner match the partial
+# "WHERE status = 'ACTIVE'" indexes even under generic prepared-statement plans
+_ACTIVE_STATUS = literal_column(f"'{SelectorStatus.ACTIVE.name}'")
+
+# Statements built once and executed with bound parameters, so SQLAlchemy
+# can reuse the compiled form without rebuilding the expression each call
+_CHECK_SELECTOR_STMT = select(DOMSelector).where(
+    DOMSelector.brand_id == bindparam("brand_id"),
+    DOMSelector.page_type == bindparam("page_type"),
+    DOMSelector.selector == bindparam("selector"),
+    DOMSelector.status == _ACTIVE_STATUS
+)
+_ACTIVE_SELECTOR_STRINGS_STMT = select(DOMSelector.selector).where(
+    DOMSelector.brand_id == bindparam("brand_id"),
+    DOMSelector.page_type == bindparam("page_type"),
+    DOMSelector.status == _ACTIVE_STATUS
+)
+# Every brand with its active selectors; brands without any come back once with NULLs
+_ALL_ACTIVE_SELECTORS_STMT = select(
+    Brand.id, DOMSelector.page_type, DOMSelector.selector
+).outerjoin(
+    DOMSelector,
+    and_(DOMSelector.brand_id == Brand.id, DOMSelector.status == _ACTIVE_STATUS)
+)
+
+# Active selector strings per (brand_id, page_type), refreshed after a short TTL
+_SELECTOR_SET_TTL_SECONDS = 60
+_selector_set_cache: Dict[Tuple[int, str], Tuple[float, FrozenSet[str]]] = {}
+
+# validate_user_provided_selector error messages
+_INVALID_FORMAT_MSG = (
+    "Invalid CSS selector format: {selector}. "
+    "Please use a valid selector (e.g., '.class-name' or '#id-name')."
+)
+_NOT_IN_DB_MSG = """The selector "{selector}" is not in the database for this page type.
+
+Would you like me to:
+1. Generate code using this selector anyway (not recommended - selector may be incorrect)
+2. Add this selector to the database first
+3. Check if you meant a different selector"""
+
+# Candidate count above which fuzzy scoring runs in a worker thread
+_FUZZY_THREAD_THRESHOLD = 200
+
+# Common element keywords used to recognise element descriptions in free text.
+# The tuple keeps lookup order for phrase extraction; the frozenset is for membership.
+_ELEMENT_KEYWORDS: Tuple[str, ...] = (
+    "button", "link", "text", "title", "heading", "image", "form", "input",
+    "field", "label", "menu", "nav", "header", "footer", "cart", "checkout",
+    "product", "name", "price", "description", "quantity", "add to cart",
+    "buy now", "submit", "search", "filter", "sort"
+)
+_ELEMENT_KEYWORD_SET: FrozenSet[str] = frozenset(_ELEMENT_KEYWORDS)
+# Substring match for any element keyword in a single pass (longest first so
+# multi-word keywords win over their prefixes)
+_ELEMENT_KEYWORD_RE = re.compile(
+    "|".join(re.escape(kw) for kw in sorted(_ELEMENT_KEYWORD_SET, key=len, reverse=True))
+)
+# "[modifier] [keyword]" / "[keyword] [modifier]" per keyword, in lookup order,
+# alongside the words a message must contain for the pattern to match
+_MODIFIER_KEYWORD_PATTERNS: Tuple[Tuple[FrozenSet[str], re.Pattern], ...] = tuple(
+    (frozenset(kw.split()), re.compile(rf'\b(\w+\s+{re.escape(kw)}|{re.escape(kw)}\s+\w+)\b'))
+    for kw in _ELEMENT_KEYWORDS
+)
+_WORD_RE = re.compile(r'\w+')
+
+
+def _is_ident(name: str) -> bool:
+    """Check that name only contains ASCII letters, digits, '-' and '_'."""
+    if not name or not name.isascii():
+        return False
+    stripped = name.translate(_IDENT_STRIP)
+    return not stripped or stripped.isalnum()
+
+
+def _has_selector_shape(selector: str) -> bool:
+    """Check the basic selector shape with set lookups instead of a regex."""
+    return (
+        len(selector) > 1
+        and selector[0] in _SELECTOR_FIRST_CHARS
+        and _SELECTOR_BODY_CHARS.issuperset(selector[1:])
+    )
+
+
+def _selector_description(selector: DOMSelector) -> str:
+    """Return the trimmed, lowercased description of a selector.
+
+    Reads the generated description_lower column, falling back to normalizing
+    description for objects that haven't been flushed and refreshed yet.
+    """
+    if selector.description_lower is not None:
+        return selector.description_lower
+    return (selector.description or "").strip().lower()
+
 
 class SelectorMatch:
     """Represents a matched selector with confidence score."""
@@ -41,17 +224,96 @@ async def check_selector_in_database(
     Returns:
         DOMSelector if found, None otherwise
     """
+    selector = selector.strip()
+    
+    # Answer misses from the cached active selector set; only hits need the row
+    if selector not in await get_active_selector_set(db, brand_id, page_type):
+        return None
+    
     result = await db.execute(
-        select(DOMSelector).where(
-            DOMSelector.brand_id == brand_id,
-            DOMSelector.page_type == page_type,
-            DOMSelector.selector == selector.strip(),
-            DOMSelector.status == SelectorStatus.ACTIVE
-        )
+        _CHECK_SELECTOR_STMT,
+        {"brand_id": brand_id, "page_type": page_type, "selector": selector}
     )
     return result.scalar_one_or_none()
 
 
+async def get_active_selector_set(
+    db: AsyncSession,
+    brand_id: int,
+    page_type: PageType
+) -> FrozenSet[str]:
+    """
+    Get the set of active selector strings for a brand and page type.
+    
+    Results are cached in-process for a short TTL so repeated lookups within a
+    conversation are answered without a database round-trip.
+    
+    Args:
+        db: Database session
+        brand_id: Brand ID
+        page_type: Page type enum
+        
+    Returns:
+        Frozen set of active selector strings
+    """
+    key = (brand_id, page_type.value)
+    now = time.monotonic()
+    cached = _selector_set_cache.get(key)
+    if cached and cached[0] > now:
+        return cached[1]
+    
+    result = await db.execute(
+        _ACTIVE_SELECTOR_STRINGS_STMT,
+        {"brand_id": brand_id, "page_type": page_type}
+    )
+    selectors = frozenset(result.scalars().all())
+    _selector_set_cache[key] = (now + _SELECTOR_SET_TTL_SECONDS, selectors)
+    return selectors
+
+
+async def preload_selector_cache(db: AsyncSession) -> None:
+    """
+    Fill the active selector cache for every brand and page type in one query.
+    
+    Called at startup so the first chat turns don't each pay for a cache miss.
+    Page types without active selectors are cached as empty sets. Entries get
+    the normal TTL, since writes from other processes never invalidate them, so
+    only lookups in the first minute after startup are served from the preload.
+    
+    Args:
+        db: Database session
+    """
+    result = await db.execute(_ALL_ACTIVE_SELECTORS_STMT)
+    grouped: Dict[Tuple[int, str], set] = {}
+    seen_brands = set()
+    for brand_id, page_type, selector in result:
+        if brand_id not in seen_brands:
+            seen_brands.add(brand_id)
+            for brand_page_type in PageType:
+                grouped[(brand_id, brand_page_type.value)] = set()
+        if selector is not None:
+            grouped[(brand_id, page_type.value)].add(selector)
+    
+    expires_at = time.monotonic() + _SELECTOR_SET_TTL_SECONDS
+    for key, selectors in grouped.items():
+        _selector_set_cache[key] = (expires_at, frozenset(selectors))
+    logger.info(f"Preloaded active selectors for {len(grouped)} brand/page types")
+
+
+def invalidate_selector_cache(brand_id: Optional[int] = None) -> None:
+    """
+    Drop cached active selector sets.
+    
+    Args:
+        brand_id: Only drop entries for this brand; drops everything if None
+    """
+    if brand_id is None:
+        _selector_set_cache.clear()
+        return
+    for key in [key for key in _selector_set_cache if key[0] == brand_id]:
+        del _selector_set_cache[key]
+
+
 async def validate_element_selector(
     db: AsyncSession,
     element_description: str,
@@ -139,6 +401,15 @@ async def validate_element_selector(
                             "message": f"Using selector '{selector}' (not in database, will be flagged for admin review)"
                         }
     
+    # Active selectors for this brand and page type
+    base_query = select(DOMSelector).where(
+        DOMSelector.brand_id == brand_id,
+        DOMSelector.page_type == page_type,
+        DOMSelector.status == _ACTIVE_STATUS
+    )
+    # Full selector list, loaded at most once per call
+    all_selectors = None
+    
     # PRIORITY 2: Check if user is responding to a multiple choice question (by number)
     # Only check this if no explicit CSS selector was found
     if user_message and conversation_context:
@@ -146,8 +417,8 @@ async def validate_element_selector(
         if conversation_context:
             # Look for previous "multiple selectors found" message
             last_assistant_msg = None
-            for msg in reversed(conversation_context[-5:]):  # Check last 5 messages
-                if "found multiple selectors" in msg.lower() or "which selector should i use" in msg.lower():
+            for msg in islice(reversed(conversation_context), 5):  # Check last 5 messages
+                if _MULTI_SELECT_HINT_RE.search(msg):
                     last_assistant_msg = msg
                     break
             
@@ -163,9 +434,14 @@ async def validate_element_selector(
                         # Validate the selected selector
                         validation = validate_selector_syntax(selected_selector)
                         if validation["is_valid"]:
-                            # Check if it's in database
-                            db_match = await check_selector_in_database(
-                                db, selected_selector, brand_id, page_type
+                            # Check if it's in database - load the active selectors once
+                            # so the fuzzy fallback below can reuse them
+                            result = await db.execute(base_query)
+                            all_selectors = result.scalars().all()
+                            selected_value = selected_selector.strip()
+                            db_match = next(
+                                (s for s in all_selectors if s.selector == selected_value),
+                                None
                             )
                             
                             if db_match:
@@ -189,16 +465,13 @@ async def validate_element_selector(
     # Normalize element description
     element_desc = element_description.strip().lower()
     
-    # Query selectors for this brand and page type
-    base_query = select(DOMSelector).where(
-        DOMSelector.brand_id == brand_id,
-        DOMSelector.page_type == page_type,
-        DOMSelector.status == SelectorStatus.ACTIVE
-    )
-    
-    # Get all selectors first
-    result = await db.execute(base_query)
-    all_selectors = result.scalars().all()
+    # Score every active selector. Element type, specificity and relationship
+    # bonuses can carry a selector past the match threshold even when its
+    # description shares no keyword with the request
+    element_keywords = _extract_keywords(element_desc)
+    if all_selectors is None:
+        result = await db.execute(base_query)
+        all_selectors = result.scalars().all()
     
     if not all_selectors:
         # No selectors exist for this page type
@@ -214,7 +487,13 @@ async def validate_element_selector(
     
     # Perform fuzzy matching
     logger.debug(f"Performing fuzzy matching on {len(all_selectors)} selectors")
-    matches = _find_matching_selectors(element_desc, all_selectors)
+    if len(all_selectors) > _FUZZY_THREAD_THRESHOLD:
+        # Large brands: keep the event loop free while scoring
+        matches = await asyncio.to_thread(
+            _find_matching_selectors, element_desc, all_selectors, element_keywords
+        )
+    else:
+        matches = _find_matching_selectors(element_desc, all_selectors, element_keywords)
     logger.debug(f"Fuzzy matching found {len(matches)} candidates")
     
     # Check if user is selecting from fuzzy matches by number
@@ -291,7 +570,8 @@ async def validate_element_selector(
 
 def _find_matching_selectors(
     element_desc: str,
-    selectors: List[DOMSelector]
+    selectors: List[DOMSelector],
+    element_keywords: Optional[List[str]] = None
 ) -> List[SelectorMatch]:
     """
     Find matching selectors using enhanced semantic matching.
@@ -302,12 +582,16 @@ def _find_matching_selectors(
     - Selector specificity bonus (20% weight)
     - Relationship context (10% weight)
     
+    element_keywords can be passed in when the caller has already extracted them.
+    
     Returns list of SelectorMatch objects sorted by confidence (highest first).
     """
     logger.info(f"Searching for selectors matching: {element_desc}")
     
     matches = []
-    element_keywords = _extract_keywords(element_desc)
+    if element_keywords is None:
+        element_keywords = _extract_keywords(element_desc)
+    element_keyword_set = frozenset(element_keywords)
     logger.debug(f"Extracted keywords: {element_keywords}")
     
     # Extract element type keywords from user request
@@ -321,11 +605,16 @@ def _find_matching_selectors(
     logger.debug(f"Element type keywords: {element_type_keywords}, Relationship context: sibling={has_sibling_context}, child={has_child_context}, parent={has_parent_context}")
     
     for selector in selectors:
-        selector_desc = (selector.description or "").strip().lower()
+        selector_desc = _selector_description(selector)
         
         if not selector_desc:
             continue
         
+        # Nothing can beat an exact description match, so stop scanning
+        if selector_desc == element_desc:
+            logger.info(f"Exact description match: {selector.selector}")
+            return [SelectorMatch(selector, 1.0, "exact")]
+        
         # Get relationships if available
         relationships = selector.relationships or {}
         
@@ -333,6 +622,7 @@ def _find_matching_selectors(
         score = _score_selector_match(
             element_desc=element_desc,
             element_keywords=element_keywords,
+            element_keyword_set=element_keyword_set,
             element_type_keywords=element_type_keywords,
             selector=selector,
             selector_desc=selector_desc,
@@ -421,6 +711,7 @@ def _extract_element_type_keywords(element_desc: str, keywords: List[str]) -> Li
 def _score_selector_match(
     element_desc: str,
     element_keywords: List[str],
+    element_keyword_set: FrozenSet[str],
     element_type_keywords: List[str],
     selector: DOMSelector,
     selector_desc: str,
@@ -441,21 +732,27 @@ def _score_selector_match(
     Returns:
         Score between 0.0 and 1.0
     """
-    score = 0.0
-    
-    # 1. Keyword matching (40% weight)
-    selector_keywords = _extract_keywords(selector_desc)
-    keyword_overlap = _calculate_keyword_overlap(element_keywords, selector_keywords)
-    score += keyword_overlap * 0.4
-    
     # Check exact match
     if selector_desc == element_desc:
         return 1.0
     
     # Check if element_desc is contained in selector description
+    containment_score = 0.0
     if element_desc in selector_desc:
         confidence = len(element_desc) / len(selector_desc) if selector_desc else 0
-        score = max(score, min(confidence, 0.9))
+        containment_score = min(confidence, 0.9)
+    
+    # 1. Keyword matching (40% weight)
+    # Keyword overlap adds at most 0.4, so skip extracting the selector's
+    # keywords when containment already scores at least that much
+    score = 0.0
+    if containment_score < 0.4:
+        selector_keyword_set = _selector_keyword_set(selector_desc)
+        keyword_overlap = _calculate_keyword_overlap(
+            element_keywords, element_keyword_set, selector_keyword_set
+        )
+        score += keyword_overlap * 0.4
+    score = max(score, containment_score)
     
     # 2. Element type matching (30% weight)
     if relationships.get('element_type'):
@@ -502,41 +799,39 @@ def _score_selector_match(
 
 def _extract_keywords(text: str) -> List[str]:
     """Extract meaningful keywords from text, filtering out common stop words."""
-    # Common stop words to filter
-    stop_words = {
-        "the", "a", "an", "and", "or", "but", "in", "on", "at", "to", "for",
-        "of", "with", "by", "from", "as", "is", "are", "was", "were", "be",
-        "been", "have", "has", "had", "do", "does", "did", "will", "would",
-        "could", "should", "may", "might", "must", "can", "this", "that",
-        "these", "those", "on", "off", "up", "down", "out", "over", "under"
-    }
-    
-    # Split by non-word characters and filter
-    words = re.findall(r'\b\w+\b', text.lower())
-    keywords = [w for w in words if len(w) > 2 and w not in stop_words]
-    
-    return keywords
+    # Words of 3+ characters, minus stop words
+    return [w for w in _KEYWORD_RE.findall(text.lower()) if w not in _STOP_WORDS]
 
 
-def _calculate_keyword_overlap(keywords1: List[str], keywords2: List[str]) -> float:
-    """Calculate overlap score between two keyword lists."""
-    if not keywords1 or not keywords2:
-        return 0.0
-    
-    set1 = set(keywords1)
-    set2 = set(keywords2)
-    
-    intersection = set1 & set2
-    union = set1 | set2
+@lru_cache(maxsize=4096)
+def _selector_keyword_set(selector_desc: str) -> FrozenSet[str]:
+    """Keyword set for a (lowercased) selector description, memoized across requests."""
+    return frozenset(_extract_keywords(selector_desc))
+
+
+def _calculate_keyword_overlap(
+    keywords1: List[str],
+    keyword_set1: FrozenSet[str],
+    keyword_set2: FrozenSet[str]
+) -> float:
+    """
+    Calculate overlap score between two keyword lists.
     
-    if not union:
+    Takes the sets pre-built so the request's keyword set is built once per
+    request rather than once per selector; the union size is derived from the
+    set sizes instead of materialising the union.
+    """
+    if not keyword_set1 or not keyword_set2:
         return 0.0
     
+    intersection_size = len(keyword_set1 & keyword_set2)
+    union_size = len(keyword_set1) + len(keyword_set2) - intersection_size
+    
     # Jaccard similarity
-    jaccard = len(intersection) / len(union)
+    jaccard = intersection_size / union_size
     
     # Also factor in how many keywords matched vs total
-    keyword_match_ratio = len(intersection) / len(keywords1) if keywords1 else 0
+    keyword_match_ratio = intersection_size / len(keywords1)
     
     # Combined score
     return (jaccard * 0.6) + (keyword_match_ratio * 0.4)
@@ -646,25 +941,26 @@ def extract_selector_choice_from_message(message: str) -> Optional[int]:
     
     message_lower = message.lower().strip()
     
+    # Just a number (be careful - only if short message). None of the
+    # patterns below can match a bare number, so check it first
+    if len(message_lower) <= 2 and message_lower.isdecimal():
+        return int(message_lower)
+    
     # Pattern 1: "use selector/option X"
-    match = re.search(r'use\s+(?:selector|option)\s+(\d+)', message_lower)
+    match = _USE_SELECTOR_RE.search(message_lower)
     if match:
         return int(match.group(1))
     
     # Pattern 2: "selector/option X"
-    match = re.search(r'(?:selector|option)\s+(\d+)', message_lower)
+    match = _SELECTOR_OPTION_RE.search(message_lower)
     if match:
         return int(match.group(1))
     
     # Pattern 3: "number X" or "use X"
-    match = re.search(r'(?:number|use)\s+(\d+)', message_lower)
+    match = _NUMBER_USE_RE.search(message_lower)
     if match:
         return int(match.group(1))
     
-    # Pattern 4: Just a number (be careful - only if short message)
-    if re.match(r'^\d+$', message_lower.strip()) and len(message_lower.strip()) <= 2:
-        return int(message_lower.strip())
-    
     return None
 
 
@@ -687,23 +983,22 @@ def extract_selector_from_choice_message(message: str, choice_num: int) -> Optio
         return None
     
     # Look for the line starting with the choice number
+    choice_str = str(choice_num)
     lines = message.split('\n')
     for line in lines:
         # Match: "N. ... (selector: ...)" - prioritize selector in parentheses
         # Pattern matches: "1. description (selector: .selector)"
-        pattern1 = rf'^{choice_num}\.\s+.*?\(selector:\s*([^\)]+)\)'
-        match1 = re.search(pattern1, line, re.IGNORECASE)
-        if match1:
-            selector = match1.group(1).strip()
+        match1 = _CHOICE_WITH_SELECTOR_RE.search(line)
+        if match1 and match1.group(1) == choice_str:
+            selector = match1.group(2).strip()
             if selector:
                 return selector
         
         # Match: "N. selector-value" - fallback if no parentheses
         # Only match if line is relatively short (likely just a selector)
-        pattern2 = rf'^{choice_num}\.\s+([^\s\)]+)(?:\s|$)'
-        match2 = re.search(pattern2, line, re.IGNORECASE)
-        if match2 and len(line.strip()) < 100:  # Short line likely just selector
-            selector = match2.group(1).strip()
+        match2 = _CHOICE_BARE_RE.search(line)
+        if match2 and match2.group(1) == choice_str and len(line.strip()) < 100:  # Short line likely just selector
+            selector = match2.group(2).strip()
             if selector and not selector.startswith('('):  # Don't match if starts with (
                 return selector
     
@@ -712,12 +1007,10 @@ def extract_selector_from_choice_message(message: str, choice_num: int) -> Optio
 
 def _format_multiple_matches_message(element_description: str, matches: List[SelectorMatch]) -> str:
     """Format message when multiple selectors match."""
-    selector_list = []
-    for i, match in enumerate(matches[:5], 1):  # Limit to 5 matches
-        desc = match.selector.description or match.selector.selector
-        selector_list.append(f"{i}. {desc} (selector: {match.selector.selector})")
-    
-    selector_text = "\n".join(selector_list)
+    selector_text = "\n".join(
+        f"{i}. {match.selector.description or match.selector.selector} (selector: {match.selector.selector})"
+        for i, match in enumerate(matches[:5], 1)  # Limit to 5 matches
+    )
     
     return f"""I found multiple selectors that might match "{element_description}":
 
@@ -753,6 +1046,15 @@ def extract_user_provided_selector(
     Returns:
         Selector string if found, None otherwise
     """
+    return _extract_user_provided_selector(message, tuple(conversation_context or ()))
+
+
+@lru_cache(maxsize=1024)
+def _extract_user_provided_selector(
+    message: str,
+    conversation_context: Tuple[str, ...]
+) -> Optional[str]:
+    """Cached implementation of extract_user_provided_selector (inputs must be hashable)."""
     message_lower = message.lower()
     
     # Check conversation context for ID/class keywords
@@ -760,115 +1062,84 @@ def extract_user_provided_selector(
     has_class_context = False
     
     if conversation_context:
-        context_text = " ".join(conversation_context).lower()
-        # Look for ID-related keywords
-        id_keywords = ["id", "identifier", "element id", "h1 id", "div id"]
-        has_id_context = any(keyword in context_text for keyword in id_keywords)
-        
-        # Look for class-related keywords
-        class_keywords = ["class", "css class", "element class", "class name"]
-        has_class_context = any(keyword in context_text for keyword in class_keywords)
+        # Scan message by message and stop once both flags are set
+        for context_message in conversation_context:
+            # Look for ID-related keywords
+            if not has_id_context and _ID_CONTEXT_RE.search(context_message):
+                has_id_context = True
+            # Look for class-related keywords
+            if not has_class_context and _CLASS_CONTEXT_RE.search(context_message):
+                has_class_context = True
+            if has_id_context and has_class_context:
+                break
+    
+    # Cheap literal checks so pattern groups that cannot match are skipped
+    has_prefix_char = "." in message or "#" in message
+    has_id_word = "id" in message_lower
+    has_class_word = "class" in message_lower
     
     # Pattern 1: Direct CSS selectors with . or #
-    direct_patterns = [
-        r'["\']([.#][\w-]+(?:[\w\s-]*)?)["\']',  # Quoted selector: ".class" or "#id"
-        r'(?:selector|css|selector)[:\s]+["\']?([.#][\w-]+(?:[\w\s-]*)?)["\']?',  # "selector: .class"
-        r'(?:selector|css|selector)[:\s]+([.#][\w-]+)',  # "selector: .class" without quotes
-        r'\b([.#][\w-]+)\b',  # Standalone selector: .class or #id
-    ]
-    
-    for pattern in direct_patterns:
-        matches = re.findall(pattern, message, re.IGNORECASE)
-        if matches:
-            selector = matches[0].strip().strip('"\'')
-            if re.match(r'^[.#\[][\w\s\-\[\]="\']+$', selector):
-                return selector
+    if has_prefix_char:
+        for pattern in _DIRECT_PATTERNS:
+            match = pattern.search(message)
+            if match:
+                selector = match.group(1).strip(_STRIP_CHARS)
+                if _has_selector_shape(selector):
+                    return selector
     
     # Pattern 2: Natural language ID references
     # Matches: "id is 'product-name'", "id='product-name'", "id: product-name", "the id product-name"
-    id_patterns = [
-        r'id\s*(?:is|=|:)\s*["\']?([a-zA-Z0-9_-]+)["\']?',  # "id is 'product-name'" or "id='product-name'"
-        r'the\s+id\s+(["\']?[a-zA-Z0-9_-]+["\']?)',  # "the id product-name"
-        r'id\s+["\']?([a-zA-Z0-9_-]+)["\']?',  # "id product-name"
-        r'h1\s+id\s*(?:is|=|:)\s*["\']?([a-zA-Z0-9_-]+)["\']?',  # "h1 id is 'product-name'"
-    ]
-    
-    for pattern in id_patterns:
-        matches = re.findall(pattern, message_lower)
-        if matches:
-            selector_name = matches[0].strip().strip('"\'')
+    if has_id_word:
+        for pattern in _ID_PATTERNS:
+            match = pattern.search(message_lower)
             # Validate it looks like a valid identifier
-            if re.match(r'^[a-zA-Z0-9_-]+$', selector_name):
-                return f"#{selector_name}"
+            if match and _is_ident(match.group(1)):
+                return f"#{match.group(1)}"
     
     # Pattern 3: Natural language class references
     # Matches: "class is 'product-title'", "class='product-title'", "the class product-title"
-    class_patterns = [
-        r'class\s*(?:is|=|:)\s*["\']?([a-zA-Z0-9_-]+)["\']?',  # "class is 'product-title'"
-        r'the\s+class\s+(["\']?[a-zA-Z0-9_-]+["\']?)',  # "the class product-title"
-        r'class\s+["\']?([a-zA-Z0-9_-]+)["\']?',  # "class product-title"
-        r'css\s+class\s*(?:is|=|:)\s*["\']?([a-zA-Z0-9_-]+)["\']?',  # "css class is 'title'"
-    ]
-    
-    for pattern in class_patterns:
-        matches = re.findall(pattern, message_lower)
-        if matches:
-            selector_name = matches[0].strip().strip('"\'')
-            if re.match(r'^[a-zA-Z0-9_-]+$', selector_name):
-                return f".{selector_name}"
+    if has_class_word:
+        for pattern in _CLASS_PATTERNS:
+            match = pattern.search(message_lower)
+            if match and _is_ident(match.group(1)):
+                return f".{match.group(1)}"
     
     # Pattern 4: "it's X" or "it is X" (after ID/class context)
-    # Only match if we have context about ID or class
-    if has_id_context or "id" in message_lower:
-        its_pattern = r"(?:it'?s?|it\s+is)\s+['\"]?([a-zA-Z0-9_-]+)['\"]?"
-        matches = re.findall(its_pattern, message_lower)
-        if matches:
-            selector_name = matches[0].strip().strip('"\'')
-            if re.match(r'^[a-zA-Z0-9_-]+$', selector_name):
-                return f"#{selector_name}"
-    
-    if has_class_context or ("class" in message_lower and "id" not in message_lower):
-        its_pattern = r"(?:it'?s?|it\s+is)\s+['\"]?([a-zA-Z0-9_-]+)['\"]?"
-        matches = re.findall(its_pattern, message_lower)
-        if matches:
-            selector_name = matches[0].strip().strip('"\'')
-            if re.match(r'^[a-zA-Z0-9_-]+$', selector_name):
-                return f".{selector_name}"
+    # Only match if we have context about ID or class; ID context wins
+    its_as_id = has_id_context or has_id_word
+    its_as_class = has_class_context or (has_class_word and not has_id_word)
+    if its_as_id or its_as_class:
+        its_match = _ITS_RE.search(message_lower)
+        if its_match:
+            selector_name = its_match.group(1)
+            if _is_ident(selector_name):
+                return f"#{selector_name}" if its_as_id else f".{selector_name}"
     
     # Pattern 5: Bare selector names (no prefix)
     # Try as ID first if we have ID context, otherwise try both
-    bare_name_pattern = r'\b([a-zA-Z][a-zA-Z0-9_-]{2,})\b'
-    # Avoid matching common words
-    common_words = {
-        "the", "and", "for", "with", "that", "this", "product", "page", "element",
-        "button", "text", "name", "title", "price", "cart", "checkout", "home"
-    }
+    # Take the first word that isn't a common word
+    bare_name = None
+    for match in _BARE_NAME.finditer(message):
+        if match.group(1).lower() not in _COMMON_WORDS:
+            bare_name = match.group(1)
+            break
     
-    matches = re.findall(bare_name_pattern, message)
-    if matches:
-        # Filter out common words and look for selector-like names
-        potential_selectors = [
-            m for m in matches 
-            if m.lower() not in common_words 
-            and '-' in m or '_' in m or m.isalnum()
-        ]
-        
-        if potential_selectors:
-            # If we have ID context, try ID first
-            if has_id_context:
-                return f"#{potential_selectors[0]}"
-            # If we have class context, try class first
-            elif has_class_context:
-                return f".{potential_selectors[0]}"
-            # Otherwise, we'll return the first one and let validation try both
-            # The caller should handle trying both # and . prefixes
-            return potential_selectors[0]
+    if bare_name:
+        # If we have ID context, try ID first
+        if has_id_context:
+            return f"#{bare_name}"
+        # If we have class context, try class first
+        elif has_class_context:
+            return f".{bare_name}"
+        # Otherwise, we'll return the first one and let validation try both
+        # The caller should handle trying both # and . prefixes
+        return bare_name
     
     # Pattern 6: Attribute selectors [attr=value]
-    attr_pattern = r'\[[\w-]+(?:=["\'][^"\']+["\'])?\]'
-    attr_matches = re.findall(attr_pattern, message)
-    if attr_matches:
-        return attr_matches[0]
+    if "[" in message:
+        attr_match = _ATTR_SELECTOR.search(message)
+        if attr_match:
+            return attr_match.group(0)
     
     return None
 
@@ -887,45 +1158,41 @@ def extract_element_description_from_message(message: str) -> Optional[str]:
     """
     message_lower = message.lower()
     
-    # Common element keywords to look for
-    element_keywords = [
-        "button", "link", "text", "title", "heading", "image", "form", "input",
-        "field", "label", "menu", "nav", "header", "footer", "cart", "checkout",
-        "product", "name", "price", "description", "quantity", "add to cart",
-        "buy now", "checkout", "submit", "search", "filter", "sort"
-    ]
+    # Every pattern below needs an element keyword, so skip them all if there is none
+    if not _ELEMENT_KEYWORD_RE.search(message_lower):
+        return None
     
     # Pattern: "change [element]" or "modify [element]"
-    change_pattern = r'(?:change|modify|update|edit|adjust)\s+([^.,!?]+?)(?:\s+to|\s+on|[,\.!?]|$)'
-    match = re.search(change_pattern, message_lower)
+    match = _CHANGE_RE.search(message_lower)
     if match:
         element_phrase = match.group(1).strip()
         # Check if it contains element keywords
-        if any(keyword in element_phrase for keyword in element_keywords):
+        if _ELEMENT_KEYWORD_RE.search(element_phrase):
             return element_phrase
     
     # Pattern: "on [page]" followed by element or before element
-    page_pattern = r'([^.,!?]+?)\s+on\s+(?:pdp|cart|checkout|home|category|search)'
-    match = re.search(page_pattern, message_lower)
+    match = _PAGE_RE.search(message_lower)
     if match:
         element_phrase = match.group(1).strip()
-        if any(keyword in element_phrase for keyword in element_keywords):
+        if _ELEMENT_KEYWORD_RE.search(element_phrase):
             return element_phrase
     
     # Pattern: "[element] on [page]"
-    reverse_pattern = r'(?:pdp|cart|checkout|home|category|search)\s+([^.,!?]+?)(?:[,\.!?]|$)'
-    match = re.search(reverse_pattern, message_lower)
+    match = _REVERSE_RE.search(message_lower)
     if match:
         element_phrase = match.group(1).strip()
-        if any(keyword in element_phrase for keyword in element_keywords):
+        if _ELEMENT_KEYWORD_RE.search(element_phrase):
             return element_phrase
     
     # Try to extract noun phrases that might be elements
     # Look for common patterns like "product name", "checkout button", etc.
-    for keyword in element_keywords:
+    # Tokenise once and only search for keywords whose words all appear
+    message_words = set(_WORD_RE.findall(message_lower))
+    for keyword_words, modifier_pattern in _MODIFIER_KEYWORD_PATTERNS:
+        if not keyword_words <= message_words:
+            continue
         # Pattern: "[modifier] [keyword]" or "[keyword] [modifier]"
-        pattern1 = rf'\b(\w+\s+{keyword}|{keyword}\s+\w+)\b'
-        match = re.search(pattern1, message_lower)
+        match = modifier_pattern.search(message_lower)
         if match:
             element_phrase = match.group(0).strip()
             # Limit length to avoid capturing too much
@@ -956,19 +1223,12 @@ async def try_both_selector_prefixes(
     id_selector = f"#{bare_selector_name}"
     class_selector = f".{bare_selector_name}"
     
-    # Check both selectors in database
-    result = await db.execute(
-        select(DOMSelector).where(
-            DOMSelector.brand_id == brand_id,
-            DOMSelector.page_type == page_type,
-            DOMSelector.status == SelectorStatus.ACTIVE,
-            DOMSelector.selector.in_([id_selector, class_selector])
-        )
-    )
-    matching_selector = result.scalar_one_or_none()
-    
-    if matching_selector:
-        return matching_selector.selector
+    # Check both selectors against the active selector set
+    active_selectors = await get_active_selector_set(db, brand_id, page_type)
+    if id_selector in active_selectors:
+        return id_selector
+    if class_selector in active_selectors:
+        return class_selector
     
     # If neither found in DB, prefer ID selector as default
     # (ID is more specific and commonly used)
@@ -1000,27 +1260,14 @@ async def validate_user_provided_selector(
     selector_normalized = selector.strip()
     
     # Basic format validation
-    if not re.match(r'^[.#\[][\w\s\-\[\]="\']+$', selector_normalized):
-        return False, f"Invalid CSS selector format: {selector_normalized}. Please use a valid selector (e.g., '.class-name' or '#id-name')."
+    if not _has_selector_shape(selector_normalized):
+        return False, _INVALID_FORMAT_MSG.format(selector=selector_normalized)
     
     # Check if selector exists in database
-    result = await db.execute(
-        select(DOMSelector).where(
-            DOMSelector.brand_id == brand_id,
-            DOMSelector.page_type == page_type,
-            DOMSelector.selector == selector_normalized,
-            DOMSelector.status == SelectorStatus.ACTIVE
-        )
-    )
-    existing_selector = result.scalar_one_or_none()
+    active_selectors = await get_active_selector_set(db, brand_id, page_type)
     
-    if existing_selector:
+    if selector_normalized in active_selectors:
         return True, None
     else:
         # Selector not in database - suggest adding it or ask for confirmation
-        return False, f"""The selector "{selector_normalized}" is not in the database for this page type.
-
-Would you like me to:
-1. Generate code using this selector anyway (not recommended - selector may be incorrect)
-2. Add this selector to the database first
-3. Check if you meant a different selector"""
+        return False, _NOT_IN_DB_MSG.format(selector=selector_normalized)
@@ -21,9 +21,9 @@ target_metadata = Base.metadata
 
 
 def get_url():
-    """Get database URL from environment or config."""
+    """Get database URL (asyncpg driver) from environment or config."""
     from app.config import settings
-    return settings.DATABASE_URL
+    return settings.ASYNC_DATABASE_URL
 
 
 def run_migrations_offline() -> None:
@@ -54,14 +54,6 @@ async def run_migrations_online() -> None:
     # Set the URL
     alembic_config["sqlalchemy.url"] = get_url()
     
-    # Transform DATABASE_URL to use asyncpg driver
-    if "sqlalchemy.url" in alembic_config:
-        database_url = alembic_config["sqlalchemy.url"]
-        if database_url.startswith("postgresql://"):
-            alembic_config["sqlalchemy.url"] = database_url.replace("postgresql://", "postgresql+asyncpg://", 1)
-        elif database_url.startswith("postgres://"):
-            alembic_config["sqlalchemy.url"] = database_url.replace("postgres://", "postgresql+asyncpg://", 1)
-    
     connectable = async_engine_from_config(
         alembic_config,
         prefix="sqlalchemy.",
@@ -0,0 +1,54 @@
+"""Helpers shared by Alembic data migrations."""
+from alembic import op
+import sqlalchemy as sa
+
+
+def batched_update(
+    table: str,
+    set_clause: str,
+    where_clause: str = "TRUE",
+    batch_size: int = 1000,
+    **params
+) -> int:
+    """
+    Run an UPDATE over a large table in id-ordered batches, committing each batch.
+
+    Rows are walked by primary key (keyset pagination), so each batch is an index
+    range scan and an interrupted migration only redoes the batch in flight. Must
+    be called from a migration's upgrade()/downgrade().
+
+    Args:
+        table: Table name (must have an integer ``id`` primary key)
+        set_clause: SQL for the SET clause, e.g. "status = 'pending'"
+        where_clause: SQL filter selecting rows to update
+        batch_size: Rows updated per committed batch
+        **params: Bound parameters referenced by set_clause/where_clause
+
+    Returns:
+        Total number of rows updated
+    """
+    statement = sa.text(f"""
+        UPDATE {table} SET {set_clause}
+        WHERE id IN (
+            SELECT id FROM {table}
+            WHERE id > :last_id AND ({where_clause})
+            ORDER BY id
+            LIMIT :batch_size
+        )
+        RETURNING id
+    """)
+
+    total = 0
+    last_id = 0
+    # Each statement commits on its own inside the autocommit block
+    with op.get_context().autocommit_block():
+        bind = op.get_bind()
+        while True:
+            ids = bind.execute(
+                statement, {**params, "last_id": last_id, "batch_size": batch_size}
+            ).scalars().all()
+            if not ids:
+                break
+            total += len(ids)
+            last_id = max(ids)
+    return total
@@ -0,0 +1,33 @@
+"""add trigram index on dom_selectors description
+
+Revision ID: 20261016100000
+Revises: 20251103152818
+Create Date: 2026-10-16 10:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '20261016100000'
+down_revision: Union[str, None] = '20251103152818'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # Trigram index so keyword prefilters (lower(description) LIKE '%kw%')
+    # used by selector fuzzy matching don't scan every row
+    op.execute("CREATE EXTENSION IF NOT EXISTS pg_trgm")
+    op.execute("""
+        CREATE INDEX ix_dom_selectors_description_trgm
+        ON dom_selectors USING gin (lower(description) gin_trgm_ops)
+    """)
+
+
+def downgrade() -> None:
+    # Drop trigram index (the extension is left in place)
+    op.drop_index('ix_dom_selectors_description_trgm', table_name='dom_selectors')
@@ -0,0 +1,46 @@
+"""add generated description_lower column to dom_selectors
+
+Revision ID: 20261016110000
+Revises: 20261016100000
+Create Date: 2026-10-16 11:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '20261016110000'
+down_revision: Union[str, None] = '20261016100000'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # Stored generated column so selector matching reads a pre-normalized description.
+    # btrim only strips spaces by default, so pass the whitespace set explicitly
+    op.add_column('dom_selectors', sa.Column(
+        'description_lower',
+        sa.String(length=500),
+        sa.Computed("lower(btrim(description, E' \\t\\n\\r\\f\\013'))", persisted=True),
+        nullable=True
+    ))
+
+    # Move the trigram index onto the generated column
+    op.drop_index('ix_dom_selectors_description_trgm', table_name='dom_selectors')
+    op.execute("""
+        CREATE INDEX ix_dom_selectors_description_trgm
+        ON dom_selectors USING gin (description_lower gin_trgm_ops)
+    """)
+
+
+def downgrade() -> None:
+    # Restore the expression index, then drop the generated column
+    op.drop_index('ix_dom_selectors_description_trgm', table_name='dom_selectors')
+    op.execute("""
+        CREATE INDEX ix_dom_selectors_description_trgm
+        ON dom_selectors USING gin (lower(description) gin_trgm_ops)
+    """)
+    op.drop_column('dom_selectors', 'description_lower')
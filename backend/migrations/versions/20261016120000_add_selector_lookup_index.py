@@ -0,0 +1,43 @@
+"""add active selector lookup index on dom_selectors
+
+Revision ID: 20261016120000
+Revises: 20261016110000
+Create Date: 2026-10-16 12:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '20261016120000'
+down_revision: Union[str, None] = '20261016110000'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # CONCURRENTLY can't run inside the migration transaction
+    with op.get_context().autocommit_block():
+        # Partial index for active selector lookups by brand, page type and selector.
+        # SQLEnum(native_enum=False) stores the enum name, so match 'ACTIVE'
+        op.execute("""
+            CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_selectors_lookup
+            ON dom_selectors(brand_id, page_type, selector)
+            WHERE status = 'ACTIVE'
+        """)
+        # (brand_id, page_type) is a prefix of the new index
+        op.execute("DROP INDEX CONCURRENTLY IF EXISTS idx_selectors_brand_page")
+
+
+def downgrade() -> None:
+    with op.get_context().autocommit_block():
+        # Restore the partial index for active selectors by brand and page type
+        op.execute("""
+            CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_selectors_brand_page
+            ON dom_selectors(brand_id, page_type)
+            WHERE status = 'active'
+        """)
+        op.execute("DROP INDEX CONCURRENTLY IF EXISTS idx_selectors_lookup")
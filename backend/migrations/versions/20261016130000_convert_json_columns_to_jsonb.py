@@ -0,0 +1,50 @@
+"""convert json columns to jsonb
+
+Revision ID: 20261016130000
+Revises: 20261016120000
+Create Date: 2026-10-16 13:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision: str = '20261016130000'
+down_revision: Union[str, None] = '20261016120000'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# (table, column) pairs stored as text JSON
+JSON_COLUMNS = [
+    ('brands', 'code_template'),
+    ('generated_code', 'request_data'),
+    ('generated_code', 'error_logs'),
+]
+
+
+def upgrade() -> None:
+    # Store as binary JSONB so reads don't re-parse the text on every access
+    for table, column in JSON_COLUMNS:
+        op.alter_column(
+            table, column,
+            type_=postgresql.JSONB(astext_type=sa.Text()),
+            existing_type=postgresql.JSON(astext_type=sa.Text()),
+            existing_nullable=True,
+            postgresql_using=f'{column}::jsonb'
+        )
+
+
+def downgrade() -> None:
+    # Revert to text JSON
+    for table, column in JSON_COLUMNS:
+        op.alter_column(
+            table, column,
+            type_=postgresql.JSON(astext_type=sa.Text()),
+            existing_type=postgresql.JSONB(astext_type=sa.Text()),
+            existing_nullable=True,
+            postgresql_using=f'{column}::json'
+        )
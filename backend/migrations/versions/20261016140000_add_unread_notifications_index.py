@@ -0,0 +1,37 @@
+"""replace notifications read index with partial unread index
+
+Revision ID: 20261016140000
+Revises: 20261016130000
+Create Date: 2026-10-16 14:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '20261016140000'
+down_revision: Union[str, None] = '20261016130000'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # CONCURRENTLY can't run inside the migration transaction
+    with op.get_context().autocommit_block():
+        # Partial index for a user's unread notifications, newest first
+        op.execute("""
+            CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_notifications_unread
+            ON notifications(user_id, created_at DESC)
+            WHERE read = false
+        """)
+        # A btree on a boolean is rarely selective enough to be used
+        op.execute("DROP INDEX CONCURRENTLY IF EXISTS ix_notifications_read")
+
+
+def downgrade() -> None:
+    with op.get_context().autocommit_block():
+        op.execute("CREATE INDEX CONCURRENTLY IF NOT EXISTS ix_notifications_read ON notifications(read)")
+        op.execute("DROP INDEX CONCURRENTLY IF EXISTS idx_notifications_unread")
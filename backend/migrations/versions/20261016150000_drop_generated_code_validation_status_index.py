@@ -0,0 +1,29 @@
+"""drop redundant generated_code validation_status index
+
+Revision ID: 20261016150000
+Revises: 20261016140000
+Create Date: 2026-10-16 15:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '20261016150000'
+down_revision: Union[str, None] = '20261016140000'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # idx_generated_status (validation_status, created_at) already serves
+    # lookups on validation_status alone
+    op.drop_index('ix_generated_code_validation_status', table_name='generated_code')
+
+
+def downgrade() -> None:
+    # Restore single-column validation_status index
+    op.create_index('ix_generated_code_validation_status', 'generated_code', ['validation_status'], unique=False)
@@ -0,0 +1,32 @@
+"""drop unused dom_selectors description trigram index
+
+Revision ID: 20261016160000
+Revises: 20261016150000
+Create Date: 2026-10-16 16:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '20261016160000'
+down_revision: Union[str, None] = '20261016150000'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # Fuzzy matching scores every active selector again, so no query filters
+    # on description_lower any more
+    op.drop_index('ix_dom_selectors_description_trgm', table_name='dom_selectors')
+
+
+def downgrade() -> None:
+    # Restore trigram index on the generated lowercased description
+    op.execute("""
+        CREATE INDEX ix_dom_selectors_description_trgm
+        ON dom_selectors USING gin (description_lower gin_trgm_ops)
+    """)
@@ -1,13 +1,18 @@
 """Seed data script for populating database with VANS and Timberland brands."""
 import asyncio
 import sys
+from functools import cache
 from pathlib import Path
+from typing import Set, Tuple
 
-# Add parent directory to path for imports
-sys.path.insert(0, str(Path(__file__).parent.parent))
+# Run as a file (python scripts/seed_data.py), the backend root is not on the
+# path; `python -m scripts.seed_data` and normal imports don't need this
+if not __package__:
+    sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
 
-from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine, async_sessionmaker
-from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncConnection, create_async_engine
+from sqlalchemy import insert, select, update
+from sqlalchemy.dialects.postgresql import insert as pg_insert
 from app.database import Base
 # Import all models to ensure relationships are resolved
 from app.models import Brand, PageTypeKnowledge, DOMSelector, CodeRule, GeneratedCode, User
@@ -16,39 +21,20 @@ from app.models.enums import (
     SelectorStatus, UserRole, BrandRole
 )
 from app.config import settings
+from app.core.auth import hash_password
 
 
-async def seed_data():
-    """Seed database with VANS and Timberland brand data."""
-    # Transform DATABASE_URL to use asyncpg driver (same as database.py)
-    database_url = settings.DATABASE_URL
-    if database_url.startswith("postgresql://"):
-        database_url = database_url.replace("postgresql://", "postgresql+asyncpg://", 1)
-    elif database_url.startswith("postgres://"):
-        database_url = database_url.replace("postgres://", "postgresql+asyncpg://", 1)
-    
-    # Create engine and session
-    engine = create_async_engine(database_url, echo=False)
-    async_session_maker = async_sessionmaker(engine, class_=AsyncSession, expire_on_commit=False)
-    
-    async with async_session_maker() as session:
-        # Check if VANS brand exists
-        vans_result = await session.execute(
-            select(Brand).where(Brand.name == "VANS")
-        )
-        vans_brand = vans_result.scalar_one_or_none()
-        
-        if not vans_brand:
-            # Create VANS Brand with global template
-            vans_brand = Brand(
-                name="VANS",
-                domain="vans.com",
-                status=BrandStatus.ACTIVE,
-                code_template={
-                    "theme": "skate",
-                    "region": "US",
-                    "currency": "USD",
-                    "global_template": """'use strict';
+_TEMPLATES_DIR = Path(__file__).parent / "seed_templates"
+
+
+@cache
+def _load_template(name: str) -> str:
+    """Read a page type test template from scripts/seed_templates, once per name."""
+    return (_TEMPLATES_DIR / f"{name}.js").read_text(encoding="utf-8").rstrip("\n")
+
+
+# VANS company-wide code structure, shown to the model as the global template
+_GLOBAL_JS_TEMPLATE = """'use strict';
 
 // ============================================================================
 // TEST HEADER
@@ -127,419 +113,325 @@ if (!utils) {{
         log('ERROR', 'Failed to wait for element', error);
     }});
 }}"""
-                }
-            )
-            session.add(vans_brand)
-            await session.flush()
-            print("✅ Created VANS brand")
-        else:
-            print("ℹ️  VANS brand already exists")
-            
-        # VANS Templates - check and create if missing
-        vans_knowledge_data = [
-            {
-                "test_type": TestType.PDP,
-                "template_code": """'use strict';
-// VANS Product Page Test Template
-function testProductPage() {
-    const productTitle = document.querySelector('.product-title');
-    const productPrice = document.querySelector('.product-price');
-    const addToCartBtn = document.querySelector('#add-to-cart-btn');
-    
-    if (!productTitle || !productPrice || !addToCartBtn) {
-        throw new Error('Required PDP elements not found');
-    }
-    
-    // Validate product information is displayed
-    console.log('Product:', productTitle.textContent);
-    console.log('Price:', productPrice.textContent);
-    
-    return {
-        success: true,
-        productTitle: productTitle.textContent,
-        productPrice: productPrice.textContent
-    };
-}""",
-                "description": "VANS Product Detail Page test template",
-                "version": "1.0",
-                "is_active": True
-            },
-            {
-                "test_type": TestType.CART,
-                "template_code": """'use strict';
-// VANS Cart Page Test Template
-function testCartPage() {
-    const cartItems = document.querySelectorAll('.cart-item');
-    const cartTotal = document.querySelector('.cart-total');
-    const checkoutBtn = document.querySelector('#checkout-button');
-    
-    if (cartItems.length === 0) {
-        throw new Error('Cart is empty');
-    }
-    
-    // Validate cart items and total
-    const itemCount = cartItems.length;
-    const total = cartTotal ? cartTotal.textContent : 'N/A';
-    
-    return {
-        success: true,
-        itemCount: itemCount,
-        total: total
-    };
-}""",
-                "description": "VANS Cart Page test template",
-                "version": "1.0",
-                "is_active": True
-            },
-            {
-                "test_type": TestType.CHECKOUT,
-                "template_code": """'use strict';
-// VANS Checkout Page Test Template
-function testCheckoutPage() {
-    const shippingForm = document.querySelector('#shipping-address-form');
-    const paymentForm = document.querySelector('#payment-form');
+
+# Static seed data, built once at import. Knowledge entries are
+# (test_type, template file, description), selectors are (page_type, selector,
+# description) and rules are (rule_type, rule_content, priority).
+_VANS_KNOWLEDGE = (
+    (TestType.PDP, "vans_pdp", "VANS Product Detail Page test template"),
+    (TestType.CART, "vans_cart", "VANS Cart Page test template"),
+    (TestType.CHECKOUT, "vans_checkout", "VANS Checkout Page test template"),
+)
+
+_TIMBERLAND_KNOWLEDGE = (
+    (TestType.PDP, "timberland_pdp", "Timberland Product Detail Page test template"),
+    (TestType.CART, "timberland_cart", "Timberland Cart Page test template"),
+    (TestType.CHECKOUT, "timberland_checkout", "Timberland Checkout Page test template"),
+)
+
+_VANS_SELECTORS = (
+    (PageType.PDP, ".product-title", "Product title on PDP"),
+    (PageType.PDP, ".product-price", "Product price display"),
+    (PageType.PDP, "#add-to-cart-btn", "Add to cart button"),
+    (PageType.PDP, ".product-images img", "Product image gallery"),
+    (PageType.PDP, ".product-description", "Product description text"),
+    (PageType.PDP, ".size-selector", "Size selection dropdown"),
+    (PageType.CART, ".cart-item", "Individual cart item container"),
+    (PageType.CART, ".cart-total", "Cart total price"),
+    (PageType.CART, "#checkout-button", "Proceed to checkout button"),
+    (PageType.CART, ".remove-item-btn", "Remove item from cart"),
+    (PageType.CHECKOUT, "#shipping-address-form", "Shipping address form"),
+    (PageType.CHECKOUT, "#payment-form", "Payment information form"),
+    (PageType.HOME, ".hero-banner", "Homepage hero banner"),
+    (PageType.HOME, ".featured-products", "Featured products section"),
+    (PageType.CATEGORY, ".product-grid", "Product grid on category page"),
+)
+
+_VANS_RULES = (
+    (RuleType.FORBIDDEN_PATTERN, "eval(", 1),
+    (RuleType.FORBIDDEN_PATTERN, "Function(", 1),
+    (RuleType.FORBIDDEN_PATTERN, ".innerHTML", 2),
+    (RuleType.FORBIDDEN_PATTERN, "document.write", 1),
+    (RuleType.FORBIDDEN_PATTERN, 'setTimeout("', 2),
+    (RuleType.REQUIRED_PATTERN, '"use strict";', 3),
+    (RuleType.MAX_LENGTH, "5000", 2),
+)
+
+_TIMBERLAND_SELECTORS = (
+    (PageType.PDP, ".timberland-product-header", "Product header on PDP"),
+    (PageType.PDP, ".tb-product-price", "Product price display"),
+    (PageType.PDP, "#tb-add-to-cart", "Add to cart button"),
+    (PageType.PDP, ".tb-product-gallery img", "Product image gallery"),
+    (PageType.PDP, ".tb-product-details", "Product details section"),
+    (PageType.PDP, ".tb-size-chart", "Size chart selector"),
+    (PageType.CART, ".tb-cart-item", "Cart item container"),
+    (PageType.CART, ".tb-cart-summary", "Cart summary section"),
+    (PageType.CART, "#tb-checkout-btn", "Checkout button"),
+    (PageType.CART, ".tb-remove-item", "Remove item button"),
+    (PageType.CHECKOUT, ".tb-shipping-section", "Shipping information section"),
+    (PageType.CHECKOUT, ".tb-payment-section", "Payment information section"),
+    (PageType.HOME, ".tb-hero-section", "Homepage hero section"),
+    (PageType.HOME, ".tb-featured-collection", "Featured collection section"),
+    (PageType.CATEGORY, ".tb-product-list", "Product list on category page"),
+)
+
+_TIMBERLAND_RULES = (
+    (RuleType.FORBIDDEN_PATTERN, "eval(", 1),
+    (RuleType.FORBIDDEN_PATTERN, "Function(", 1),
+    (RuleType.FORBIDDEN_PATTERN, ".innerHTML", 2),
+    (RuleType.FORBIDDEN_PATTERN, "document.write", 1),
+    (RuleType.FORBIDDEN_PATTERN, 'setInterval("', 2),
+    (RuleType.REQUIRED_PATTERN, '"use strict";', 3),
+    (RuleType.MAX_LENGTH, "5000", 2),
+)
+
+
+# One entry per brand: the brand row and the child rows seeded under it
+_BRAND_SPECS = (
+    {
+        "brand": {
+            "name": "VANS",
+            "domain": "vans.com",
+            "status": BrandStatus.ACTIVE,
+            "code_template": {
+                "theme": "skate",
+                "region": "US",
+                "currency": "USD",
+                "global_template": _GLOBAL_JS_TEMPLATE
+            }
+        },
+        "knowledge": _VANS_KNOWLEDGE,
+        "selectors": _VANS_SELECTORS,
+        "rules": _VANS_RULES,
+    },
+    {
+        "brand": {
+            "name": "Timberland",
+            "domain": "timberland.com",
+            "status": BrandStatus.ACTIVE,
+            "code_template": {"theme": "outdoor", "region": "US", "currency": "USD"}
+        },
+        "knowledge": _TIMBERLAND_KNOWLEDGE,
+        "selectors": _TIMBERLAND_SELECTORS,
+        "rules": _TIMBERLAND_RULES,
+    },
+)
+
+
+_DEFAULT_PASSWORD = "changeme123"
+
+# Default accounts: the user row (its brand referenced by name), the fields
+# reset on an account that already exists, and the messages for each outcome
+_DEFAULT_USERS = (
+    {
+        "user": {
+            "email": "admin@opalsafecode.com",
+            "name": "Super Admin",
+            "role": UserRole.ADMIN,
+            "brand_role": BrandRole.SUPER_ADMIN.value,
+        },
+        "brand": None,
+        "reset": {"brand_role": BrandRole.SUPER_ADMIN.value, "name": "Super Admin"},
+        "created": "✅ Created super admin user: admin@opalsafecode.com / changeme123",
+        "updated": "✅ Updated admin user to super_admin: admin@opalsafecode.com",
+    },
+    {
+        "user": {
+            "email": "admin@vans.com",
+            "name": "VANS Admin",
+            "role": UserRole.ADMIN,
+            "brand_role": BrandRole.BRAND_ADMIN.value,
+        },
+        "brand": "VANS",
+        "reset": {"brand_role": BrandRole.BRAND_ADMIN.value},
+        "created": "✅ Created VANS brand admin: admin@vans.com / changeme123",
+        "updated": "✅ Updated VANS admin to brand_admin: admin@vans.com",
+    },
+    {
+        "user": {
+            "email": "user@vans.com",
+            "name": "VANS User",
+            "role": UserRole.USER,
+            "brand_role": BrandRole.BRAND_USER.value,
+        },
+        "brand": "VANS",
+        "reset": {"brand_role": BrandRole.BRAND_USER.value},
+        "created": "✅ Created VANS user: user@vans.com / changeme123",
+        "updated": "✅ Updated VANS user to brand_user: user@vans.com",
+    },
+)
+
+
+async def _existing_keys(conn: AsyncConnection, model, brand_id: int, *key_columns) -> Set[tuple]:
+    """Key tuples already stored for a brand in one table, fetched in one query."""
+    result = await conn.execute(select(*key_columns).where(model.brand_id == brand_id))
+    return {tuple(row) for row in result}
+
+
+async def _seed_brand(conn: AsyncConnection, brand_id: int, spec: dict) -> Tuple[int, int, int]:
+    """
+    Insert the page knowledge, selectors and rules a brand is missing.
     
-    if (!shippingForm || !paymentForm) {
-        throw new Error('Checkout forms not found');
-    }
+    Each table gets one query for the keys already present and one batched
+    insert, and the row dicts are released before the next brand is seeded.
     
-    // Validate forms are present and accessible
-    return {
-        success: true,
-        shippingFormPresent: !!shippingForm,
-        paymentFormPresent: !!paymentForm
-    };
-}""",
-                "description": "VANS Checkout Page test template",
+    Returns:
+        Number of (knowledge, selectors, rules) rows created
+    """
+    existing_knowledge = await _existing_keys(
+        conn, PageTypeKnowledge, brand_id, PageTypeKnowledge.test_type
+    )
+    new_knowledge = []
+    for test_type, template_name, description in spec["knowledge"]:
+        if (test_type,) not in existing_knowledge:
+            new_knowledge.append({
+                "brand_id": brand_id,
+                "test_type": test_type,
+                "template_code": _load_template(template_name),
+                "description": description,
                 "version": "1.0",
-                "is_active": True
-            }
-        ]
-        
-        vans_knowledge_created = 0
-        for knowledge_data in vans_knowledge_data:
-            existing = await session.execute(
-                select(PageTypeKnowledge).where(
-                    PageTypeKnowledge.brand_id == vans_brand.id,
-                    PageTypeKnowledge.test_type == knowledge_data["test_type"]
-                )
-            )
-            if not existing.scalar_one_or_none():
-                knowledge = PageTypeKnowledge(
-                    brand_id=vans_brand.id,
-                    **knowledge_data
-                )
-                session.add(knowledge)
-                vans_knowledge_created += 1
-        
-        # VANS DOM Selectors - check and create if missing
-        vans_selectors_data = [
-            {"page_type": PageType.PDP, "selector": ".product-title", "description": "Product title on PDP"},
-            {"page_type": PageType.PDP, "selector": ".product-price", "description": "Product price display"},
-            {"page_type": PageType.PDP, "selector": "#add-to-cart-btn", "description": "Add to cart button"},
-            {"page_type": PageType.PDP, "selector": ".product-images img", "description": "Product image gallery"},
-            {"page_type": PageType.PDP, "selector": ".product-description", "description": "Product description text"},
-            {"page_type": PageType.PDP, "selector": ".size-selector", "description": "Size selection dropdown"},
-            {"page_type": PageType.CART, "selector": ".cart-item", "description": "Individual cart item container"},
-            {"page_type": PageType.CART, "selector": ".cart-total", "description": "Cart total price"},
-            {"page_type": PageType.CART, "selector": "#checkout-button", "description": "Proceed to checkout button"},
-            {"page_type": PageType.CART, "selector": ".remove-item-btn", "description": "Remove item from cart"},
-            {"page_type": PageType.CHECKOUT, "selector": "#shipping-address-form", "description": "Shipping address form"},
-            {"page_type": PageType.CHECKOUT, "selector": "#payment-form", "description": "Payment information form"},
-            {"page_type": PageType.HOME, "selector": ".hero-banner", "description": "Homepage hero banner"},
-            {"page_type": PageType.HOME, "selector": ".featured-products", "description": "Featured products section"},
-            {"page_type": PageType.CATEGORY, "selector": ".product-grid", "description": "Product grid on category page"},
-        ]
-        
-        vans_selectors_created = 0
-        for selector_data in vans_selectors_data:
-            existing = await session.execute(
-                select(DOMSelector).where(
-                    DOMSelector.brand_id == vans_brand.id,
-                    DOMSelector.selector == selector_data["selector"]
-                )
-            )
-            if not existing.scalar_one_or_none():
-                selector = DOMSelector(
-                    brand_id=vans_brand.id,
-                    status=SelectorStatus.ACTIVE,
-                    **selector_data
-                )
-                session.add(selector)
-                vans_selectors_created += 1
-        
-        # VANS Code Rules - check and create if missing
-        vans_rules_data = [
-            {"rule_type": RuleType.FORBIDDEN_PATTERN, "rule_content": "eval(", "priority": 1},
-            {"rule_type": RuleType.FORBIDDEN_PATTERN, "rule_content": "Function(", "priority": 1},
-            {"rule_type": RuleType.FORBIDDEN_PATTERN, "rule_content": ".innerHTML", "priority": 2},
-            {"rule_type": RuleType.FORBIDDEN_PATTERN, "rule_content": "document.write", "priority": 1},
-            {"rule_type": RuleType.FORBIDDEN_PATTERN, "rule_content": 'setTimeout("', "priority": 2},
-            {"rule_type": RuleType.REQUIRED_PATTERN, "rule_content": '"use strict";', "priority": 3},
-            {"rule_type": RuleType.MAX_LENGTH, "rule_content": "5000", "priority": 2},
-        ]
-        
-        vans_rules_created = 0
-        for rule_data in vans_rules_data:
-            existing = await session.execute(
-                select(CodeRule).where(
-                    CodeRule.brand_id == vans_brand.id,
-                    CodeRule.rule_type == rule_data["rule_type"],
-                    CodeRule.rule_content == rule_data["rule_content"]
-                )
-            )
-            if not existing.scalar_one_or_none():
-                rule = CodeRule(
-                    brand_id=vans_brand.id,
-                    **rule_data
-                )
-                session.add(rule)
-                vans_rules_created += 1
-            
-        # Check if Timberland brand exists
-        timberland_result = await session.execute(
-            select(Brand).where(Brand.name == "Timberland")
-        )
-        timberland_brand = timberland_result.scalar_one_or_none()
-        
-        if not timberland_brand:
-            # Create Timberland Brand
-            timberland_brand = Brand(
-                name="Timberland",
-                domain="timberland.com",
-                status=BrandStatus.ACTIVE,
-                code_template={"theme": "outdoor", "region": "US", "currency": "USD"}
-            )
-            session.add(timberland_brand)
-            await session.flush()
-            print("✅ Created Timberland brand")
-        else:
-            print("ℹ️  Timberland brand already exists")
-            
-        # Timberland Templates - check and create if missing
-        timberland_knowledge_data = [
-            {
-                "test_type": TestType.PDP,
-                "template_code": """'use strict';
-// Timberland Product Page Test Template
-function testProductPage() {
-    const productHeader = document.querySelector('.timberland-product-header');
-    const priceDisplay = document.querySelector('.tb-product-price');
-    const addToCartBtn = document.querySelector('#tb-add-to-cart');
+                "is_active": True,
+            })
+    if new_knowledge:
+        await conn.execute(insert(PageTypeKnowledge), new_knowledge)
     
-    if (!productHeader || !priceDisplay || !addToCartBtn) {
-        throw new Error('Required PDP elements not found');
-    }
+    existing_selectors = await _existing_keys(conn, DOMSelector, brand_id, DOMSelector.selector)
+    new_selectors = []
+    for page_type, selector, description in spec["selectors"]:
+        if (selector,) not in existing_selectors:
+            new_selectors.append({
+                "brand_id": brand_id,
+                "page_type": page_type,
+                "selector": selector,
+                "description": description,
+                "status": SelectorStatus.ACTIVE,
+            })
+    if new_selectors:
+        # Plain dicts through Core insert() go out as one multi-row INSERT
+        await conn.execute(insert(DOMSelector), new_selectors)
     
-    return {
-        success: true,
-        productHeader: productHeader.textContent,
-        price: priceDisplay.textContent
-    };
-}""",
-                "description": "Timberland Product Detail Page test template",
-                "version": "1.0",
-                "is_active": True
-            },
-            {
-                "test_type": TestType.CART,
-                "template_code": """'use strict';
-// Timberland Cart Page Test Template
-function testCartPage() {
-    const cartItems = document.querySelectorAll('.tb-cart-item');
-    const cartSummary = document.querySelector('.tb-cart-summary');
+    existing_rules = await _existing_keys(
+        conn, CodeRule, brand_id, CodeRule.rule_type, CodeRule.rule_content
+    )
+    new_rules = []
+    for rule_type, rule_content, priority in spec["rules"]:
+        if (rule_type, rule_content) not in existing_rules:
+            new_rules.append({
+                "brand_id": brand_id,
+                "rule_type": rule_type,
+                "rule_content": rule_content,
+                "priority": priority,
+            })
+    if new_rules:
+        await conn.execute(insert(CodeRule), new_rules)
     
-    if (cartItems.length === 0) {
-        throw new Error('Cart is empty');
-    }
+    return len(new_knowledge), len(new_selectors), len(new_rules)
+
+
+@cache
+def _seed_password_hash(password: str) -> str:
+    """
+    bcrypt hash for a seeded account's password, computed once per password.
     
-    return {
-        success: true,
-        itemCount: cartItems.length,
-        summary: cartSummary ? cartSummary.textContent : 'N/A'
-    };
-}""",
-                "description": "Timberland Cart Page test template",
-                "version": "1.0",
-                "is_active": True
-            },
-            {
-                "test_type": TestType.CHECKOUT,
-                "template_code": """'use strict';
-// Timberland Checkout Page Test Template
-function testCheckoutPage() {
-    const shippingSection = document.querySelector('.tb-shipping-section');
-    const paymentSection = document.querySelector('.tb-payment-section');
-    const orderReview = document.querySelector('.tb-order-review');
+    The default accounts share one password, so they deliberately share one
+    hash (and salt) too. Only acceptable for seed data.
+    """
+    return hash_password(password)
+
+
+async def _ensure_user(conn: AsyncConnection, user: dict, password: str, reset: dict) -> bool:
+    """
+    Create a default user, or apply `reset` to the existing account.
     
-    if (!shippingSection || !paymentSection || !orderReview) {
-        throw new Error('Required checkout sections not found');
-    }
+    Returns:
+        True if the user was created, False if it already existed
+    """
+    user_id = await conn.scalar(select(User.id).where(User.email == user["email"]))
+    if user_id is None:
+        await conn.execute(insert(User), {**user, "password_hash": _seed_password_hash(password)})
+        return True
+    await conn.execute(update(User).where(User.id == user_id).values(**reset))
+    return False
+
+
+async def seed_data():
+    """Seed database with VANS and Timberland brand data."""
+    # Create the engine. The seed runs serially on one connection, and
+    # its data can be regenerated, so skip JIT and the WAL flush on commit
+    engine = create_async_engine(
+        settings.ASYNC_DATABASE_URL,
+        echo=False,
+        pool_size=1,
+        max_overflow=0,
+        connect_args={"server_settings": {"jit": "off", "synchronous_commit": "off"}},
+    )
     
-    return {
-        success: true,
-        allSectionsPresent: true
-    };
-}""",
-                "description": "Timberland Checkout Page test template",
-                "version": "1.0",
-                "is_active": True
-            }
-        ]
-        
-        timberland_knowledge_created = 0
-        for knowledge_data in timberland_knowledge_data:
-            existing = await session.execute(
-                select(PageTypeKnowledge).where(
-                    PageTypeKnowledge.brand_id == timberland_brand.id,
-                    PageTypeKnowledge.test_type == knowledge_data["test_type"]
-                )
-            )
-            if not existing.scalar_one_or_none():
-                knowledge = PageTypeKnowledge(
-                    brand_id=timberland_brand.id,
-                    **knowledge_data
-                )
-                session.add(knowledge)
-                timberland_knowledge_created += 1
-        
-        # Timberland DOM Selectors - check and create if missing
-        timberland_selectors_data = [
-            {"page_type": PageType.PDP, "selector": ".timberland-product-header", "description": "Product header on PDP"},
-            {"page_type": PageType.PDP, "selector": ".tb-product-price", "description": "Product price display"},
-            {"page_type": PageType.PDP, "selector": "#tb-add-to-cart", "description": "Add to cart button"},
-            {"page_type": PageType.PDP, "selector": ".tb-product-gallery img", "description": "Product image gallery"},
-            {"page_type": PageType.PDP, "selector": ".tb-product-details", "description": "Product details section"},
-            {"page_type": PageType.PDP, "selector": ".tb-size-chart", "description": "Size chart selector"},
-            {"page_type": PageType.CART, "selector": ".tb-cart-item", "description": "Cart item container"},
-            {"page_type": PageType.CART, "selector": ".tb-cart-summary", "description": "Cart summary section"},
-            {"page_type": PageType.CART, "selector": "#tb-checkout-btn", "description": "Checkout button"},
-            {"page_type": PageType.CART, "selector": ".tb-remove-item", "description": "Remove item button"},
-            {"page_type": PageType.CHECKOUT, "selector": ".tb-shipping-section", "description": "Shipping information section"},
-            {"page_type": PageType.CHECKOUT, "selector": ".tb-payment-section", "description": "Payment information section"},
-            {"page_type": PageType.HOME, "selector": ".tb-hero-section", "description": "Homepage hero section"},
-            {"page_type": PageType.HOME, "selector": ".tb-featured-collection", "description": "Featured collection section"},
-            {"page_type": PageType.CATEGORY, "selector": ".tb-product-list", "description": "Product list on category page"},
-        ]
-        
-        timberland_selectors_created = 0
-        for selector_data in timberland_selectors_data:
-            existing = await session.execute(
-                select(DOMSelector).where(
-                    DOMSelector.brand_id == timberland_brand.id,
-                    DOMSelector.selector == selector_data["selector"]
-                )
-            )
-            if not existing.scalar_one_or_none():
-                selector = DOMSelector(
-                    brand_id=timberland_brand.id,
-                    status=SelectorStatus.ACTIVE,
-                    **selector_data
-                )
-                session.add(selector)
-                timberland_selectors_created += 1
-        
-        # Timberland Code Rules - check and create if missing
-        timberland_rules_data = [
-            {"rule_type": RuleType.FORBIDDEN_PATTERN, "rule_content": "eval(", "priority": 1},
-            {"rule_type": RuleType.FORBIDDEN_PATTERN, "rule_content": "Function(", "priority": 1},
-            {"rule_type": RuleType.FORBIDDEN_PATTERN, "rule_content": ".innerHTML", "priority": 2},
-            {"rule_type": RuleType.FORBIDDEN_PATTERN, "rule_content": "document.write", "priority": 1},
-            {"rule_type": RuleType.FORBIDDEN_PATTERN, "rule_content": 'setInterval("', "priority": 2},
-            {"rule_type": RuleType.REQUIRED_PATTERN, "rule_content": '"use strict";', "priority": 3},
-            {"rule_type": RuleType.MAX_LENGTH, "rule_content": "5000", "priority": 2},
-        ]
-        
-        timberland_rules_created = 0
-        for rule_data in timberland_rules_data:
-            existing = await session.execute(
-                select(CodeRule).where(
-                    CodeRule.brand_id == timberland_brand.id,
-                    CodeRule.rule_type == rule_data["rule_type"],
-                    CodeRule.rule_content == rule_data["rule_content"]
-                )
-            )
-            if not existing.scalar_one_or_none():
-                rule = CodeRule(
-                    brand_id=timberland_brand.id,
-                    **rule_data
-                )
-                session.add(rule)
-                timberland_rules_created += 1
-            
-        # Create default users - check if they exist
-        admin_result = await session.execute(
-            select(User).where(User.email == "admin@opalsafecode.com")
+    # One transaction for the whole seed, committed when the block exits. Rows
+    # are never read back as objects, so Core statements skip the ORM session
+    async with engine.begin() as conn:
+        # Create all brands in a single INSERT ... RETURNING, rather than one
+        # flush per brand to learn its id. Brand names are unique, so existing
+        # brands are skipped by the conflict clause and only new ones come back
+        brand_rows = [spec["brand"] for spec in _BRAND_SPECS]
+        created_brands = await conn.execute(
+            pg_insert(Brand)
+            .on_conflict_do_nothing(index_elements=["name"])
+            .returning(Brand.name, Brand.id),
+            brand_rows
         )
-        admin_user = admin_result.scalar_one_or_none()
-        
-        if not admin_user:
-            admin_user = User(
-                email="admin@opalsafecode.com",
-                name="Super Admin",
-                role=UserRole.ADMIN,
-                brand_id=None,
-                brand_role=BrandRole.SUPER_ADMIN.value
+        brand_ids = dict(created_brands.all())
+        created_names = set(brand_ids)
+        existing_names = [row["name"] for row in brand_rows if row["name"] not in brand_ids]
+        if existing_names:
+            existing_brands = await conn.execute(
+                select(Brand.name, Brand.id).where(Brand.name.in_(existing_names))
             )
-            admin_user.set_password("changeme123")
-            session.add(admin_user)
-            print("✅ Created super admin user: admin@opalsafecode.com / changeme123")
-        else:
-            # Update existing admin to super_admin
-            admin_user.brand_role = BrandRole.SUPER_ADMIN.value
-            admin_user.name = "Super Admin"
-            print("✅ Updated admin user to super_admin: admin@opalsafecode.com")
+            brand_ids.update(existing_brands.all())
         
-        # Create VANS brand admin
-        vans_admin_result = await session.execute(
-            select(User).where(User.email == "admin@vans.com")
-        )
-        vans_admin_user = vans_admin_result.scalar_one_or_none()
+        for row in brand_rows:
+            if row["name"] in created_names:
+                print(f"✅ Created {row['name']} brand")
+            else:
+                print(f"ℹ️  {row['name']} brand already exists")
         
-        if not vans_admin_user:
-            vans_admin_user = User(
-                email="admin@vans.com",
-                name="VANS Admin",
-                role=UserRole.ADMIN,
-                brand_id=vans_brand.id,
-                brand_role=BrandRole.BRAND_ADMIN.value
+        # Seed child rows one brand at a time
+        summary = "\n✅ Seed data loaded successfully!\n"
+        for spec in _BRAND_SPECS:
+            name = spec["brand"]["name"]
+            knowledge_created, selectors_created, rules_created = await _seed_brand(
+                conn, brand_ids[name], spec
             )
-            vans_admin_user.set_password("changeme123")
-            session.add(vans_admin_user)
-            print("✅ Created VANS brand admin: admin@vans.com / changeme123")
-        else:
-            # Update existing to brand_admin
-            vans_admin_user.brand_role = BrandRole.BRAND_ADMIN.value
-            print("✅ Updated VANS admin to brand_admin: admin@vans.com")
-        
-        user_result = await session.execute(
-            select(User).where(User.email == "user@vans.com")
-        )
-        user_user = user_result.scalar_one_or_none()
-        
-        if not user_user:
-            user_user = User(
-                email="user@vans.com",
-                name="VANS User",
-                role=UserRole.USER,
-                brand_id=vans_brand.id,
-                brand_role=BrandRole.BRAND_USER.value
+            summary += (
+                f"   - {name}: {knowledge_created} page knowledge entries, "
+                f"{selectors_created} selectors, {rules_created} rules created\n"
             )
-            user_user.set_password("changeme123")
-            session.add(user_user)
-            print("✅ Created VANS user: user@vans.com / changeme123")
-        else:
-            # Update existing user to brand_user
-            user_user.brand_role = BrandRole.BRAND_USER.value
-            print("✅ Updated VANS user to brand_user: user@vans.com")
         
-        await session.commit()
-        print("\n✅ Seed data loaded successfully!")
-        print(f"   - VANS: {vans_knowledge_created} page knowledge entries, {vans_selectors_created} selectors, {vans_rules_created} rules created")
-        print(f"   - Timberland: {timberland_knowledge_created} page knowledge entries, {timberland_selectors_created} selectors, {timberland_rules_created} rules created")
+        # Create default users, or reset the role of existing ones
+        for spec in _DEFAULT_USERS:
+            brand_id = brand_ids[spec["brand"]] if spec["brand"] else None
+            created = await _ensure_user(
+                conn,
+                {**spec["user"], "brand_id": brand_id},
+                password=_DEFAULT_PASSWORD,
+                reset=spec["reset"],
+            )
+            print(spec["created"] if created else spec["updated"])
+    
+    sys.stdout.write(summary)
     
     await engine.dispose()
 
 
+def main() -> None:
+    """Command-line entry point for the seed script."""
+    # uvloop ships with uvicorn[standard]; fall back to the default loop without it
+    try:
+        import uvloop
+    except ImportError:
+        asyncio.run(seed_data())
+    else:
+        uvloop.run(seed_data())
+
+
 if __name__ == "__main__":
-    asyncio.run(seed_data())
+    main()
@@ -0,0 +1,16 @@
+'use strict';
+// Timberland Cart Page Test Template
+function testCartPage() {
+    const cartItems = document.querySelectorAll('.tb-cart-item');
+    const cartSummary = document.querySelector('.tb-cart-summary');
+    
+    if (cartItems.length === 0) {
+        throw new Error('Cart is empty');
+    }
+    
+    return {
+        success: true,
+        itemCount: cartItems.length,
+        summary: cartSummary ? cartSummary.textContent : 'N/A'
+    };
+}
@@ -0,0 +1,16 @@
+'use strict';
+// Timberland Checkout Page Test Template
+function testCheckoutPage() {
+    const shippingSection = document.querySelector('.tb-shipping-section');
+    const paymentSection = document.querySelector('.tb-payment-section');
+    const orderReview = document.querySelector('.tb-order-review');
+    
+    if (!shippingSection || !paymentSection || !orderReview) {
+        throw new Error('Required checkout sections not found');
+    }
+    
+    return {
+        success: true,
+        allSectionsPresent: true
+    };
+}
@@ -0,0 +1,17 @@
+'use strict';
+// Timberland Product Page Test Template
+function testProductPage() {
+    const productHeader = document.querySelector('.timberland-product-header');
+    const priceDisplay = document.querySelector('.tb-product-price');
+    const addToCartBtn = document.querySelector('#tb-add-to-cart');
+    
+    if (!productHeader || !priceDisplay || !addToCartBtn) {
+        throw new Error('Required PDP elements not found');
+    }
+    
+    return {
+        success: true,
+        productHeader: productHeader.textContent,
+        price: priceDisplay.textContent
+    };
+}
@@ -0,0 +1,21 @@
+'use strict';
+// VANS Cart Page Test Template
+function testCartPage() {
+    const cartItems = document.querySelectorAll('.cart-item');
+    const cartTotal = document.querySelector('.cart-total');
+    const checkoutBtn = document.querySelector('#checkout-button');
+    
+    if (cartItems.length === 0) {
+        throw new Error('Cart is empty');
+    }
+    
+    // Validate cart items and total
+    const itemCount = cartItems.length;
+    const total = cartTotal ? cartTotal.textContent : 'N/A';
+    
+    return {
+        success: true,
+        itemCount: itemCount,
+        total: total
+    };
+}
@@ -0,0 +1,17 @@
+'use strict';
+// VANS Checkout Page Test Template
+function testCheckoutPage() {
+    const shippingForm = document.querySelector('#shipping-address-form');
+    const paymentForm = document.querySelector('#payment-form');
+    
+    if (!shippingForm || !paymentForm) {
+        throw new Error('Checkout forms not found');
+    }
+    
+    // Validate forms are present and accessible
+    return {
+        success: true,
+        shippingFormPresent: !!shippingForm,
+        paymentFormPresent: !!paymentForm
+    };
+}
@@ -0,0 +1,21 @@
+'use strict';
+// VANS Product Page Test Template
+function testProductPage() {
+    const productTitle = document.querySelector('.product-title');
+    const productPrice = document.querySelector('.product-price');
+    const addToCartBtn = document.querySelector('#add-to-cart-btn');
+    
+    if (!productTitle || !productPrice || !addToCartBtn) {
+        throw new Error('Required PDP elements not found');
+    }
+    
+    // Validate product information is displayed
+    console.log('Product:', productTitle.textContent);
+    console.log('Price:', productPrice.textContent);
+    
+    return {
+        success: true,
+        productTitle: productTitle.textContent,
+        productPrice: productPrice.textContent
+    };
+}
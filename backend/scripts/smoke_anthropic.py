@@ -0,0 +1,21 @@
+"""Smoke check that the Anthropic client can be created from ANTHROPIC_API_KEY."""
+import os
+from anthropic import Anthropic
+
+
+def main() -> None:
+    """Load the API key from the environment and try to create a client."""
+    api_key = os.getenv("ANTHROPIC_API_KEY")
+    print(f"API Key loaded: {api_key[:10]}..." if api_key else "No API key")
+    
+    # Try to create client
+    try:
+        client = Anthropic(api_key=api_key)
+        print("✓ Client created successfully")
+        print(f"Client type: {type(client)}")
+    except Exception as e:
+        print(f"✗ Error creating client: {e}")
+
+
+if __name__ == "__main__":
+    main()
@@ -9,6 +9,12 @@ from sqlalchemy.pool import NullPool
 from app.main import app
 from app.database import Base, get_db
 from app.config import settings
+from app.services.selector_validator import invalidate_selector_cache
+
+try:
+    import uvloop
+except ImportError:  # not available on Windows
+    uvloop = None
 
 # Test database URL
 TEST_DATABASE_URL = settings.DATABASE_URL.replace(
@@ -33,8 +39,11 @@ TestSessionLocal = async_sessionmaker(
 
 @pytest.fixture(scope="session")
 def event_loop():
-    """Create event loop for the test session."""
-    loop = asyncio.get_event_loop_policy().new_event_loop()
+    """Create event loop for the test session, on uvloop when it is installed."""
+    if uvloop is not None:
+        loop = uvloop.new_event_loop()
+    else:
+        loop = asyncio.get_event_loop_policy().new_event_loop()
     yield loop
     loop.close()
 
@@ -50,17 +59,41 @@ async def setup_test_database():
         await conn.run_sync(Base.metadata.drop_all)
 
 
+@pytest.fixture(autouse=True)
+def clear_selector_cache():
+    """Start and end every test with an empty active selector cache."""
+    invalidate_selector_cache()
+    yield
+    invalidate_selector_cache()
+
+
 @pytest.fixture
 async def test_db() -> AsyncGenerator[AsyncSession, None]:
-    """Provide a test database session with automatic rollback."""
-    async with TestSessionLocal() as session:
-        async with session.begin():
+    """
+    Provide a test database session with automatic rollback.
+    
+    The session joins an outer transaction through SAVEPOINTs, so commits made
+    by the code under test are still undone when the outer transaction rolls back.
+    """
+    async with test_engine.connect() as conn:
+        transaction = await conn.begin()
+        async with TestSessionLocal(
+            bind=conn, join_transaction_mode="create_savepoint"
+        ) as session:
             yield session
-            await session.rollback()
+        await transaction.rollback()
+
+
+@pytest.fixture(scope="session")
+def asgi_transport() -> ASGITransport:
+    """ASGI transport into the app, shared by every test client."""
+    return ASGITransport(app=app)
 
 
 @pytest.fixture
-async def test_client(test_db: AsyncSession) -> AsyncGenerator[AsyncClient, None]:
+async def test_client(
+    test_db: AsyncSession, asgi_transport: ASGITransport
+) -> AsyncGenerator[AsyncClient, None]:
     """Provide an async HTTP client with overridden database dependency."""
     
     async def override_get_db():
@@ -69,7 +102,7 @@ async def test_client(test_db: AsyncSession) -> AsyncGenerator[AsyncClient, None
     app.dependency_overrides[get_db] = override_get_db
     
     async with AsyncClient(
-        transport=ASGITransport(app=app),
+        transport=asgi_transport,
         base_url="http://test"
     ) as client:
         yield client
@@ -0,0 +1,102 @@
+"""Tests for chat API endpoints."""
+import pytest
+import uuid
+from datetime import datetime, timedelta, timezone
+from httpx import AsyncClient
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.api.deps import get_db as api_get_db
+from app.core.auth import get_current_user_dependency
+from app.main import app
+from app.models.conversation import Conversation
+from app.models.enums import UserRole
+from app.models.message import Message
+from app.models.user import User
+
+
+@pytest.fixture
+async def chat_user(test_db: AsyncSession) -> User:
+    """A user stored in the test session."""
+    user = User(
+        email=f"chat-{uuid.uuid4().hex[:8]}@example.com",
+        password_hash="not-a-real-hash",
+        role=UserRole.USER
+    )
+    test_db.add(user)
+    await test_db.flush()
+    return user
+
+
+@pytest.fixture
+async def chat_client(test_client: AsyncClient, test_db: AsyncSession, chat_user: User) -> AsyncClient:
+    """test_client with the endpoints' database and current user bound to the test session."""
+
+    async def override_get_db():
+        yield test_db
+
+    app.dependency_overrides[api_get_db] = override_get_db
+    app.dependency_overrides[get_current_user_dependency] = lambda: chat_user
+    return test_client
+
+
+class TestListConversations:
+    """Test GET /api/v1/chat/conversations"""
+
+    async def test_previews_and_last_messages(
+        self, chat_client: AsyncClient, test_db: AsyncSession, chat_user: User
+    ):
+        """Each conversation shows its own first user message and latest message."""
+        start = datetime(2026, 1, 1, tzinfo=timezone.utc)
+        older = Conversation(user_id=chat_user.id, updated_at=start + timedelta(hours=1))
+        newer = Conversation(user_id=chat_user.id, updated_at=start + timedelta(hours=2))
+        empty = Conversation(user_id=chat_user.id, updated_at=start)
+        test_db.add_all([older, newer, empty])
+        await test_db.flush()
+
+        # Added out of order so ids don't line up with created_at
+        test_db.add_all([
+            Message(conversation_id=older.id, role="user", content="Thanks",
+                    created_at=start + timedelta(minutes=3)),
+            Message(conversation_id=older.id, role="assistant", content="Welcome",
+                    created_at=start),
+            Message(conversation_id=older.id, role="user", content="Change the hero banner",
+                    created_at=start + timedelta(minutes=1)),
+            Message(conversation_id=older.id, role="assistant", content="Hero banner updated",
+                    created_at=start + timedelta(minutes=2)),
+            Message(conversation_id=newer.id, role="assistant", content="Price updated",
+                    created_at=start + timedelta(minutes=12)),
+            Message(conversation_id=newer.id, role="user", content="Also make it bold",
+                    created_at=start + timedelta(minutes=11)),
+            Message(conversation_id=newer.id, role="user", content="Make the price red",
+                    created_at=start + timedelta(minutes=10)),
+        ])
+        await test_db.flush()
+
+        response = await chat_client.get("/api/v1/chat/conversations")
+        assert response.status_code == 200
+
+        data = response.json()
+        assert [item["id"] for item in data] == [str(newer.id), str(older.id), str(empty.id)]
+        assert [(item["preview"], item["last_message"]) for item in data] == [
+            ("Make the price red", "Price updated"),
+            ("Change the hero banner", "Thanks"),
+            ("New conversation", None),
+        ]
+
+    async def test_other_users_conversations_are_excluded(
+        self, chat_client: AsyncClient, test_db: AsyncSession
+    ):
+        """Conversations owned by another user are not listed."""
+        other_user = User(
+            email=f"other-{uuid.uuid4().hex[:8]}@example.com",
+            password_hash="not-a-real-hash",
+            role=UserRole.USER
+        )
+        test_db.add(other_user)
+        await test_db.flush()
+        test_db.add(Conversation(user_id=other_user.id))
+        await test_db.flush()
+
+        response = await chat_client.get("/api/v1/chat/conversations")
+        assert response.status_code == 200
+        assert response.json() == []
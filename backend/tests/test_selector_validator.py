@@ -0,0 +1,337 @@
+"""Tests for selector extraction helpers and the active selector cache."""
+import pytest
+import time
+import uuid
+from httpx import AsyncClient
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.api.deps import get_db as api_get_db
+from app.core.auth import get_current_user_dependency
+from app.main import app
+from app.models.brand import Brand
+from app.models.dom_selector import DOMSelector
+from app.models.enums import BrandRole, PageType, UserRole
+from app.models.user import User
+from app.services import selector_validator
+from app.services.selector_validator import (
+    extract_user_provided_selector,
+    get_active_selector_set,
+    invalidate_selector_cache,
+    preload_selector_cache,
+    validate_element_selector,
+)
+
+
+class TestBareSelectorNames:
+    """Test bare selector names (no # or . prefix) in user messages."""
+
+    def test_common_words_are_skipped(self):
+        """Common words must not be returned as selector names."""
+        assert extract_user_provided_selector("the hero-banner") == "hero-banner"
+        assert extract_user_provided_selector("for promo_tile") == "promo_tile"
+
+    def test_only_common_words_returns_none(self):
+        """A message made only of common words has no bare selector."""
+        assert extract_user_provided_selector("the product title") is None
+        assert extract_user_provided_selector("this price text") is None
+
+    def test_id_context_prefixes_bare_name(self):
+        """ID context from earlier messages turns a bare name into an ID selector."""
+        assert extract_user_provided_selector("hero-banner", ["what is the id?"]) == "#hero-banner"
+
+    def test_class_context_prefixes_bare_name(self):
+        """Class context from earlier messages turns a bare name into a class selector."""
+        assert extract_user_provided_selector(
+            "hero-banner", ["which css class is it?"]
+        ) == ".hero-banner"
+
+    def test_its_reply_in_id_context(self):
+        """"it's x" after an ID question is read as an ID."""
+        assert extract_user_provided_selector(
+            "it's hero-banner", ["What is the element id?"]
+        ) == "#hero-banner"
+
+
+class TestDirectSelectors:
+    """Test selectors written with a . or # prefix in user messages."""
+
+    def test_quoted_selector_wins_over_later_quoted_selector(self):
+        """The first quoted selector is used even after a "selector:" label."""
+        assert extract_user_provided_selector('selector: ".foo" and also ".bar"') == ".foo"
+
+    def test_quoted_selector_after_css_keyword(self):
+        """A "css" keyword before a quoted selector doesn't skip it."""
+        message = 'Change the css ".title" color to match ".subtitle"'
+        assert extract_user_provided_selector(message) == ".title"
+
+    def test_quoted_selector_wins_over_earlier_standalone(self):
+        """Quoted selectors take priority over standalone ones earlier in the message."""
+        assert extract_user_provided_selector('.first or maybe "#second"') == "#second"
+
+    def test_labelled_selector_without_quotes(self):
+        """A "selector:" label picks up an unquoted selector."""
+        assert extract_user_provided_selector("selector: #hero") == "#hero"
+
+    def test_standalone_selector(self):
+        """A standalone selector attached to a tag name is found without quotes or a label."""
+        assert extract_user_provided_selector("style h1.title in red") == ".title"
+
+
+class TestNaturalLanguageSelectors:
+    """Test "id is x" / "class is x" phrasings in user messages."""
+
+    def test_id_is_wins_over_earlier_bare_id(self):
+        """An "id is x" phrasing wins even when "the id y" comes first."""
+        assert extract_user_provided_selector("the id foo, id is bar") == "#bar"
+
+    def test_class_is_wins_over_earlier_bare_class(self):
+        """A "class is x" phrasing wins even when "the class y" comes first."""
+        assert extract_user_provided_selector("the class promo, class is hero") == ".hero"
+
+    def test_the_id_is_reads_value_not_verb(self):
+        """"the id is x" resolves to x rather than "is"."""
+        assert extract_user_provided_selector("the id is hero") == "#hero"
+
+    def test_the_id_wins_over_earlier_id(self):
+        """"the id x" takes priority over a plain "id y" earlier in the message."""
+        assert extract_user_provided_selector("id foo and the id bar") == "#bar"
+
+    def test_quoted_class_name(self):
+        """Quotes around the class name are not part of the selector."""
+        assert extract_user_provided_selector("the css class is 'promo-tile'") == ".promo-tile"
+
+
+class TestMixedSelectorMessages:
+    """Test messages that contain several selectors or phrasings at once."""
+
+    def test_first_of_several_quoted_selectors(self):
+        """With several quoted selectors the first one is used."""
+        assert extract_user_provided_selector('use "#a" then "#b"') == "#a"
+
+    def test_direct_selector_wins_over_id_phrasing(self):
+        """A prefixed selector wins over an earlier "id is x" phrasing."""
+        assert extract_user_provided_selector('id is hero and ".promo"') == ".promo"
+
+    def test_id_phrasing_wins_over_class_phrasing(self):
+        """ID phrasings are checked before class phrasings."""
+        assert extract_user_provided_selector("class is promo and id is hero") == "#hero"
+
+
+class TestSelectorDescriptionMatching:
+    """Test matching against selectors whose generated column isn't loaded yet."""
+
+    def test_transient_selector_uses_normalized_description(self):
+        """A selector without description_lower matches on its trimmed, lowercased description."""
+        dom_selector = DOMSelector(
+            page_type=PageType.PDP,
+            selector=".hero-banner",
+            description="\tHero Banner\n"
+        )
+        matches = selector_validator._find_matching_selectors("hero banner", [dom_selector])
+        assert len(matches) == 1
+        assert matches[0].match_type == "exact"
+
+
+async def _create_brand(test_db: AsyncSession) -> Brand:
+    """Add a brand to the test session and return it with its id."""
+    suffix = uuid.uuid4().hex[:8]
+    brand = Brand(name=f"Cache Brand {suffix}", domain=f"cache{suffix}.com")
+    test_db.add(brand)
+    await test_db.flush()
+    return brand
+
+
+async def _add_selector(test_db: AsyncSession, brand_id: int, selector: str) -> DOMSelector:
+    """Add an active PDP selector directly, bypassing the API and its cache invalidation."""
+    dom_selector = DOMSelector(
+        brand_id=brand_id,
+        page_type=PageType.PDP,
+        selector=selector,
+        description="Cache test selector"
+    )
+    test_db.add(dom_selector)
+    await test_db.flush()
+    return dom_selector
+
+
+class TestActiveSelectorCache:
+    """Test the per brand/page type cache behind get_active_selector_set."""
+
+    async def test_miss_loads_active_selectors(self, test_db: AsyncSession):
+        """A cache miss reads the active selectors from the database."""
+        brand = await _create_brand(test_db)
+        await _add_selector(test_db, brand.id, ".hero")
+
+        selectors = await get_active_selector_set(test_db, brand.id, PageType.PDP)
+
+        assert selectors == frozenset({".hero"})
+        assert (brand.id, PageType.PDP.value) in selector_validator._selector_set_cache
+
+    async def test_hit_returns_cached_set(self, test_db: AsyncSession):
+        """Within the TTL the cached set is returned without re-reading the table."""
+        brand = await _create_brand(test_db)
+        await _add_selector(test_db, brand.id, ".hero")
+        first = await get_active_selector_set(test_db, brand.id, PageType.PDP)
+
+        await _add_selector(test_db, brand.id, ".promo")
+        second = await get_active_selector_set(test_db, brand.id, PageType.PDP)
+
+        assert second is first
+        assert ".promo" not in second
+
+    async def test_expired_entry_is_reloaded(self, test_db: AsyncSession):
+        """Once an entry has expired the next lookup reads the table again."""
+        brand = await _create_brand(test_db)
+        await _add_selector(test_db, brand.id, ".hero")
+        await get_active_selector_set(test_db, brand.id, PageType.PDP)
+        await _add_selector(test_db, brand.id, ".promo")
+
+        key = (brand.id, PageType.PDP.value)
+        _, cached = selector_validator._selector_set_cache[key]
+        selector_validator._selector_set_cache[key] = (0.0, cached)
+
+        selectors = await get_active_selector_set(test_db, brand.id, PageType.PDP)
+        assert selectors == frozenset({".hero", ".promo"})
+
+    async def test_invalidate_one_brand_keeps_others(self, test_db: AsyncSession):
+        """Invalidating a brand drops only that brand's entries."""
+        brand_a = await _create_brand(test_db)
+        brand_b = await _create_brand(test_db)
+        await get_active_selector_set(test_db, brand_a.id, PageType.PDP)
+        await get_active_selector_set(test_db, brand_b.id, PageType.PDP)
+
+        invalidate_selector_cache(brand_a.id)
+
+        assert (brand_a.id, PageType.PDP.value) not in selector_validator._selector_set_cache
+        assert (brand_b.id, PageType.PDP.value) in selector_validator._selector_set_cache
+
+    async def test_invalidate_all(self, test_db: AsyncSession):
+        """Invalidating without a brand drops every entry."""
+        brand = await _create_brand(test_db)
+        await get_active_selector_set(test_db, brand.id, PageType.PDP)
+
+        invalidate_selector_cache()
+
+        assert selector_validator._selector_set_cache == {}
+
+    async def test_preload_fills_every_page_type(self, test_db: AsyncSession):
+        """Preloading caches active selectors, and empty sets for page types without any."""
+        brand = await _create_brand(test_db)
+        empty_brand = await _create_brand(test_db)
+        await _add_selector(test_db, brand.id, ".hero")
+
+        await preload_selector_cache(test_db)
+
+        cache = selector_validator._selector_set_cache
+        assert cache[(brand.id, PageType.PDP.value)][1] == frozenset({".hero"})
+        assert cache[(brand.id, PageType.CART.value)][1] == frozenset()
+        for page_type in PageType:
+            assert cache[(empty_brand.id, page_type.value)][1] == frozenset()
+
+    async def test_preloaded_entries_use_the_normal_ttl(self, test_db: AsyncSession):
+        """Preloaded entries expire on the same TTL as ones filled by a cache miss."""
+        brand = await _create_brand(test_db)
+        before = time.monotonic()
+        await preload_selector_cache(test_db)
+        after = time.monotonic()
+
+        expires_at, _ = selector_validator._selector_set_cache[(brand.id, PageType.PDP.value)]
+        ttl = selector_validator._SELECTOR_SET_TTL_SECONDS
+        assert before + ttl <= expires_at <= after + ttl
+
+
+@pytest.fixture
+async def admin_client(test_client: AsyncClient, test_db: AsyncSession) -> AsyncClient:
+    """test_client with the endpoints' database and admin checks bound to the test session."""
+
+    async def override_get_db():
+        yield test_db
+
+    app.dependency_overrides[api_get_db] = override_get_db
+    app.dependency_overrides[get_current_user_dependency] = lambda: User(
+        email="cache-admin@example.com",
+        role=UserRole.ADMIN,
+        brand_role=BrandRole.SUPER_ADMIN.value
+    )
+    return test_client
+
+
+class TestSelectorCacheInvalidation:
+    """Test that selector API writes are visible through the cache right away."""
+
+    async def test_created_selector_is_visible(self, admin_client: AsyncClient, test_db: AsyncSession):
+        """Creating a selector through the API drops the brand's cached set."""
+        brand = await _create_brand(test_db)
+        assert await get_active_selector_set(test_db, brand.id, PageType.PDP) == frozenset()
+
+        response = await admin_client.post(
+            "/api/v1/selectors/",
+            json={
+                "brand_id": brand.id,
+                "page_type": "pdp",
+                "selector": ".new-hero",
+                "description": "New hero"
+            }
+        )
+        assert response.status_code == 201
+
+        selectors = await get_active_selector_set(test_db, brand.id, PageType.PDP)
+        assert selectors == frozenset({".new-hero"})
+
+    async def test_updated_selector_is_visible(self, admin_client: AsyncClient, test_db: AsyncSession):
+        """Updating a selector through the API drops the brand's cached set."""
+        brand = await _create_brand(test_db)
+        dom_selector = await _add_selector(test_db, brand.id, ".old-hero")
+        assert await get_active_selector_set(test_db, brand.id, PageType.PDP) == frozenset({".old-hero"})
+
+        response = await admin_client.put(
+            f"/api/v1/selectors/{dom_selector.id}",
+            json={"selector": ".renamed-hero"}
+        )
+        assert response.status_code == 200
+
+        selectors = await get_active_selector_set(test_db, brand.id, PageType.PDP)
+        assert selectors == frozenset({".renamed-hero"})
+
+    async def test_deleted_brand_selectors_are_dropped(self, admin_client: AsyncClient, test_db: AsyncSession):
+        """Deleting a brand through the API drops its cached set along with its selectors."""
+        brand = await _create_brand(test_db)
+        await _add_selector(test_db, brand.id, ".hero")
+        assert await get_active_selector_set(test_db, brand.id, PageType.PDP) == frozenset({".hero"})
+
+        response = await admin_client.delete(f"/api/v1/brands/{brand.id}")
+        assert response.status_code == 204
+
+        assert (brand.id, PageType.PDP.value) not in selector_validator._selector_set_cache
+        assert await get_active_selector_set(test_db, brand.id, PageType.PDP) == frozenset()
+
+
+class TestFuzzySelectorMatching:
+    """Test which selectors validate_element_selector scores for a description."""
+
+    async def test_bonus_only_match_kept_alongside_keyword_match(self, test_db: AsyncSession):
+        """A selector matching only through type and specificity bonuses is still offered."""
+        brand = await _create_brand(test_db)
+        test_db.add_all([
+            DOMSelector(
+                brand_id=brand.id,
+                page_type=PageType.PDP,
+                selector=".promo-button",
+                description="Promo button label"
+            ),
+            DOMSelector(
+                brand_id=brand.id,
+                page_type=PageType.PDP,
+                selector="[data-test-id='add-to-bag']",
+                description="Add to bag",
+                relationships={"element_type": "button"}
+            ),
+        ])
+        await test_db.flush()
+
+        result = await validate_element_selector(test_db, "promo button", PageType.PDP, brand.id)
+
+        assert result["status"] == "multiple_matches"
+        assert [match.selector.selector for match in result["matches"]] == [
+            ".promo-button", "[data-test-id='add-to-bag']"
+        ]